@@ -11,6 +11,9 @@ HISTORIC_DATA_DIR = os.path.join(BASE_DIR, "historic_dataset")
 LOG_FILE = os.path.join(BASE_DIR, "logs", "scraper.log")
 MAX_ARTICLES = 30
 
+# Resolved chromedriver binary, reused across runs (CNBC-TV18 listing page)
+CHROMEDRIVER_PATH_CACHE = os.path.join(BASE_DIR, ".cache", "chromedriver_path")
+
 # ============== News Fetcher Output Paths ==============
 NEWS_FETCHER_OUTPUT_DIR = os.path.join(OUTPUT_DIR, "news_fetcher")
 
@@ -0,0 +1,87 @@
+"""
+OHLCV CSV -> Parquet Migration
+==============================
+One-time (re-runnable) conversion of the per-day tick CSVs
+
+    correct_ohlcv_tick_data/data_ohlcv/<Company>/<Company> DD-MM-YYYY.csv
+
+into a partitioned Parquet store read by the correlation checker:
+
+    output/ohlcv_parquet/company=<Company>/date=YYYY-MM-DD/part-0.parquet
+
+Only the columns the checker aggregates are kept, with timestamps already
+parsed to naive IST, so loading a day skips CSV tokenizing and date parsing.
+Days whose Parquet file is already at least as new as the CSV are skipped;
+CSVs that change later (e.g. the day still being collected) are picked up
+again on the next run, and the checker reads the CSV until then.
+
+Requires pyarrow.
+
+Usage:
+    python migrate_ohlcv_parquet.py
+"""
+
+import os
+import re
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from modules.correlation_checker_independentstep import (
+    HAS_PARQUET,
+    OHLCV_BASE,
+    OHLCV_PARQUET_DIR,
+    _day_source,
+    _parquet_path_for,
+    _parse_tick_timestamps,
+    _read_day_csv,
+)
+
+DAY_CSV_SUFFIX = re.compile(r" \d{2}-\d{2}-\d{4}\.csv$")
+
+
+def migrate_day(csv_path) -> bool:
+    """Write one day's CSV to its Parquet partition. Returns False if unreadable."""
+    try:
+        day_df = _read_day_csv(str(csv_path))
+    except Exception as e:
+        print(f"⚠️ Skipping {csv_path.name}: {e}")
+        return False
+    if "timestamp" in day_df.columns:
+        day_df["timestamp"] = _parse_tick_timestamps(day_df["timestamp"])
+
+    pq_path = _parquet_path_for(csv_path)
+    os.makedirs(pq_path.parent, exist_ok=True)
+    tmp_path = pq_path.with_suffix(".parquet.tmp")
+    day_df.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, pq_path)
+    return True
+
+
+def main():
+    if not HAS_PARQUET:
+        print("❌ pyarrow is not installed (pip install pyarrow).")
+        sys.exit(1)
+    if not OHLCV_BASE.exists():
+        print(f"❌ OHLCV directory not found: {OHLCV_BASE}")
+        sys.exit(1)
+
+    written = skipped = failed = 0
+    for folder in sorted(p for p in OHLCV_BASE.iterdir() if p.is_dir()):
+        for csv_path in sorted(folder.glob("*.csv")):
+            # "<name> DD-MM-YYYY.csv" only, same as the checker's lookup
+            if not DAY_CSV_SUFFIX.search(csv_path.name):
+                continue
+            if _day_source(csv_path)[0].endswith(".parquet"):
+                skipped += 1
+            elif migrate_day(csv_path):
+                written += 1
+            else:
+                failed += 1
+
+    print(f"✅ Parquet store: {OHLCV_PARQUET_DIR}")
+    print(f"   Written: {written}, up to date: {skipped}, failed: {failed}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,8 @@ import pandas as pd
 import json
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
 from config import (
     MERGED_NEWS_PATH,
@@ -31,6 +33,12 @@ NEGATIVE_CONTEXT_KEYWORDS = {
     ]
 }
 
+# One compiled alternation per context key: any negative word as a whole word
+NEGATIVE_CONTEXT_PATTERNS = {
+    keyword: re.compile(r"\b(?:" + "|".join(re.escape(word) for word in words) + r")\b")
+    for keyword, words in NEGATIVE_CONTEXT_KEYWORDS.items()
+}
+
 # Exclusion patterns: parent keyword -> subsidiary suffixes (skip parent if subsidiary follows)
 KEYWORD_EXCLUSIONS = {
     "tiger": ["global", "brands"],
@@ -83,9 +91,192 @@ BUSINESS_ACTION_KEYWORDS = [
     "rating", "upgrade", "downgrade", "target", "buy", "sell", "hold",
 ]
 
+# Merged alternations so headline-level checks run column-wise over all articles
+SKIP_HEADLINE_PATTERN = "|".join(f"(?:{p})" for p in SKIP_HEADLINE_PATTERNS)
+BUSINESS_ACTION_PATTERN = "|".join(re.escape(action) for action in BUSINESS_ACTION_KEYWORDS)
 
-def tag_and_save_articles():
-    mapping_df = pd.read_csv(MAPPING_CSV_PATH)
+
+def _dedup_key(article_id, symbol) -> str:
+    """Composite (article_id, symbol) key as a single string (no tuple allocation)."""
+    return f"{article_id}\x00{symbol}"
+
+
+def _write_json(path: str, data: list):
+    """Write a tagged-rows file (parent directory must already exist)."""
+    with open(path, "w", encoding="utf-8") as f_json:
+        json.dump(data, f_json, ensure_ascii=False, indent=2)
+
+
+def is_generic_keyword(keyword: str) -> bool:
+    """Check if keyword is too generic to tag alone."""
+    return keyword.lower() in GENERIC_KEYWORDS
+
+
+def is_excluded_by_context(keyword: str, text: str) -> bool:
+    """Skip parent keyword if subsidiary suffix follows."""
+    keyword_lower = keyword.lower()
+    for base_kw, exclusions in KEYWORD_EXCLUSIONS.items():
+        if keyword_lower == base_kw or keyword_lower.startswith(base_kw + " "):
+            for excl in exclusions:
+                excl_pattern = r"\b" + re.escape(keyword_lower) + r"\s+" + re.escape(excl) + r"\b"
+                if re.search(excl_pattern, text):
+                    return True
+    return False
+
+
+def has_negative_context(keyword: str, text_lower: str) -> bool:
+    """Check if (lowercased) text contains negative context words for this keyword."""
+    pattern = NEGATIVE_CONTEXT_PATTERNS.get(keyword.lower())
+    return bool(pattern and pattern.search(text_lower))
+
+
+@lru_cache(maxsize=None)
+def is_full_company_name(keyword: str, company_name: str) -> bool:
+    """Check if keyword is a full company name or clear alias (not just a short generic term)."""
+    kw_lower = keyword.lower()
+    name_lower = company_name.lower()
+    
+    # Full name match or substantial part of name
+    if kw_lower in name_lower or name_lower in kw_lower:
+        return len(kw_lower) >= 8  # Reasonably long match
+    
+    # Stock symbol (usually uppercase, 3-15 chars)
+    if keyword.isupper() and 3 <= len(keyword) <= 15:
+        return True
+    
+    # Multi-word keyword is more specific
+    if " " in keyword and len(keyword) >= 10:
+        return True
+    
+    return False
+
+
+def keyword_in_content(keyword: str, kw_pattern: re.Pattern, content_lower: str) -> bool:
+    """
+    Check if keyword appears in (lowercased) content (confirms headline).
+    A plain substring test runs first, in C; the \\b-bounded regex only runs on hits.
+    """
+    if not content_lower or keyword not in content_lower:
+        return False
+    return bool(kw_pattern.search(content_lower))
+
+
+@lru_cache(maxsize=50_000)
+def _tag_headline_only(headline_lower: str, index_key: tuple) -> tuple:
+    """
+    Headline-only part of tagging (no content needed), memoised by headline.
+    Returns (pair_idx, match_start, match_end, base_signals) for every keyword
+    that matches the headline and survives the exclusion/generic filters, in
+    keyword order. base_signals covers the full-name and symbol signals.
+    """
+    pair_keywords, _, pair_companies, keyword_regex, keyword_groups = load_keyword_index(*index_key)
+    
+    # One C-level scan: at each position the lookahead reports the longest keyword
+    # starting there; keyword_groups adds the shorter keywords matching at the same
+    # start. Keep the first occurrence of each keyword, as re.search would.
+    spans = {}
+    for m in keyword_regex.finditer(headline_lower):
+        start = m.start(1)
+        for i in keyword_groups[m.group(1)]:
+            if i not in spans:
+                spans[i] = (start, start + len(pair_keywords[i]))
+    
+    candidates = []
+    for i in sorted(spans):  # keyword order: longest first
+        kw = pair_keywords[i]
+        
+        # Skip if excluded by context (e.g., "reliance retail" shouldn't match "reliance")
+        if is_excluded_by_context(kw, headline_lower):
+            continue
+        
+        # Skip generic keywords unless they're part of a longer match
+        if is_generic_keyword(kw):
+            continue
+        
+        base_signals = 0
+        
+        # Signal 1: Full company name or clear alias (weight 2 — passes threshold alone)
+        if is_full_company_name(kw, pair_companies[i]["CompanyName"]):
+            base_signals += 2
+        
+        # Signal 4: Stock symbol match (very reliable)
+        if kw.upper() == pair_companies[i]["Symbol"]:
+            base_signals += 3  # Triple weight for exact symbol match
+        
+        candidates.append((i, *spans[i], base_signals))
+    return tuple(candidates)
+
+
+def tag_companies(headline: str, content: str, headline_has_action: bool, index_key: tuple):
+    """
+    Tag companies with strict confidence rules:
+    - Require at least 2 confidence signals
+    - Return [] if confidence < 90%
+    Generic/macro headlines are filtered out by the caller, which also
+    supplies the business-action flag computed over the whole batch.
+    index_key is the (mapping_path, mtime_ns) key for load_keyword_index().
+    Returned company dicts are shared with the keyword mapping; treat them
+    as read-only.
+    """
+    pair_keywords, pair_patterns, pair_companies, _, _ = load_keyword_index(*index_key)
+    tagged_companies = []
+    text = headline.lower()
+    content_lower = content.lower()
+    full_text = text + " " + content_lower
+    seen_symbols = set()
+    matched_spans = {}  # keyword -> (start, end) of its match in the headline
+    
+    for i, match_start, match_end, confidence_signals in _tag_headline_only(text, index_key):
+        kw = pair_keywords[i]
+        company_info = pair_companies[i]
+        symbol = company_info["Symbol"]
+        if symbol in seen_symbols:
+            continue
+        
+        # Skip if negative context is present (e.g., "college campus" shouldn't match "Campus")
+        if has_negative_context(kw, full_text):
+            continue
+        
+        # CONFIDENCE SCORING: Need at least 2 of these conditions
+        # (full-name and symbol signals come from the cached headline scan)
+        
+        # Signal 2: Business/financial action in headline
+        if headline_has_action:
+            confidence_signals += 1
+        
+        # Signal 3: Keyword confirmed in content
+        if keyword_in_content(kw, pair_patterns[i], content_lower):
+            confidence_signals += 1
+        
+        # Require at least 2 confidence signals
+        if confidence_signals < 2:
+            continue
+        
+        # Skip overlapping shorter keywords
+        skip = False
+        for prev_kw, (prev_start, prev_end) in matched_spans.items():
+            if kw in prev_kw or prev_kw in kw:
+                if (match_start >= prev_start and match_start < prev_end) or \
+                   (match_end > prev_start and match_end <= prev_end):
+                    skip = True
+                    break
+        
+        if skip:
+            continue
+        
+        tagged_companies.append(company_info)
+        seen_symbols.add(symbol)
+        matched_spans[kw] = (match_start, match_end)
+    
+    return tagged_companies
+
+
+def build_keyword_index(mapping_df: pd.DataFrame) -> tuple:
+    """
+    Build the keyword scan index from the company mapping, longest keyword first.
+    Returns parallel tuples (keywords, compiled word-boundary patterns, company dicts),
+    plus one combined keyword regex and a keyword -> pair indices lookup for it.
+    """
     mapping_df["Keyword"] = mapping_df["Keyword"].fillna("").astype(str)
 
     # Build keyword -> company mapping, sorted by keyword length (longest first)
@@ -104,159 +295,45 @@ def tag_and_save_articles():
     
     keyword_company_pairs.sort(key=lambda x: len(x[0]), reverse=True)
 
-    def is_generic_keyword(keyword: str) -> bool:
-        """Check if keyword is too generic to tag alone."""
-        return keyword.lower() in GENERIC_KEYWORDS
-
-    def is_excluded_by_context(keyword: str, text: str) -> bool:
-        """Skip parent keyword if subsidiary suffix follows."""
-        keyword_lower = keyword.lower()
-        for base_kw, exclusions in KEYWORD_EXCLUSIONS.items():
-            if keyword_lower == base_kw or keyword_lower.startswith(base_kw + " "):
-                for excl in exclusions:
-                    excl_pattern = r"\b" + re.escape(keyword_lower) + r"\s+" + re.escape(excl) + r"\b"
-                    if re.search(excl_pattern, text):
-                        return True
-        return False
+    # Lower the pairs into parallel tuples (keyword, compiled \bkw\b pattern, company)
+    # built once per run, so the scan never re-compiles or re-escapes a pattern
+    pair_keywords = tuple(kw for kw, _ in keyword_company_pairs)
+    pair_patterns = tuple(re.compile(r"\b" + re.escape(kw) + r"\b") for kw in pair_keywords)
+    pair_companies = tuple(company_info for _, company_info in keyword_company_pairs)
 
-    def should_skip_headline(headline: str) -> bool:
-        """Skip macro/sector/analyst headlines."""
-        text = headline.lower()
-        for pattern in SKIP_HEADLINE_PATTERNS:
-            if re.search(pattern, text):
-                return True
-        return False
+    keyword_to_indices = {}
+    for i, kw in enumerate(pair_keywords):
+        keyword_to_indices.setdefault(kw, []).append(i)
 
-        return False
+    # Single alternation, longest first, inside a lookahead so finditer reports
+    # overlapping keywords too (\bkw\b semantics at every position)
+    keyword_regex = re.compile(
+        r"(?=\b(" + "|".join(re.escape(kw) for kw in keyword_to_indices) + r")\b)"
+    )
 
-    def has_negative_context(keyword: str, text: str) -> bool:
-        """Check if text contains negative context words for this keyword."""
-        keyword_lower = keyword.lower()
-        if keyword_lower in NEGATIVE_CONTEXT_KEYWORDS:
-            text_lower = text.lower()
-            # aggressive check: any of the negative words present?
-            for neg_word in NEGATIVE_CONTEXT_KEYWORDS[keyword_lower]:
-                if f" {neg_word} " in f" {text_lower} ":  # basic word boundary check
-                    return True
-        return False
+    # Every keyword matching at a given start is a prefix of the longest one found
+    # there, ending on a word boundary inside it
+    boundary = re.compile(r"\b")
+    keyword_groups = {}
+    for kw, indices in keyword_to_indices.items():
+        group = list(indices)
+        for end in range(MIN_KEYWORD_LENGTH, len(kw)):
+            prefix = kw[:end]
+            if prefix in keyword_to_indices and boundary.match(kw, end):
+                group.extend(keyword_to_indices[prefix])
+        keyword_groups[kw] = tuple(group)
 
-    def has_business_action(text: str) -> bool:
-        """Check if text contains business/financial action keywords."""
-        text_lower = text.lower()
-        return any(action in text_lower for action in BUSINESS_ACTION_KEYWORDS)
+    return pair_keywords, pair_patterns, pair_companies, keyword_regex, keyword_groups
 
-    def is_full_company_name(keyword: str, company_name: str) -> bool:
-        """Check if keyword is a full company name or clear alias (not just a short generic term)."""
-        kw_lower = keyword.lower()
-        name_lower = company_name.lower()
-        
-        # Full name match or substantial part of name
-        if kw_lower in name_lower or name_lower in kw_lower:
-            return len(kw_lower) >= 8  # Reasonably long match
-        
-        # Stock symbol (usually uppercase, 3-15 chars)
-        if keyword.isupper() and 3 <= len(keyword) <= 15:
-            return True
-        
-        # Multi-word keyword is more specific
-        if " " in keyword and len(keyword) >= 10:
-            return True
-        
-        return False
 
-    def keyword_in_content(keyword: str, content: str) -> bool:
-        """Check if keyword appears in content (confirms headline)."""
-        if not content:
-            return False
-        pattern = r"\b" + re.escape(keyword.lower()) + r"\b"
-        return bool(re.search(pattern, content.lower()))
-
-    def tag_companies(headline: str, content: str = ""):
-        """
-        Tag companies with strict confidence rules:
-        - Skip if generic/macro news
-        - Require at least 2 confidence signals
-        - Return [] if confidence < 90%
-        """
-        if not headline:
-            return []
-        
-        if should_skip_headline(headline):
-            return []
-        
-        tagged_companies = []
-        text = headline.lower()
-        full_text = (headline + " " + content).lower()
-        seen_symbols = set()
-        matched_keywords = set()
-        
-        for kw, company_info in keyword_company_pairs:
-            symbol = company_info["Symbol"]
-            if symbol in seen_symbols:
-                continue
-            
-            pattern = r"\b" + re.escape(kw) + r"\b"
-            match = re.search(pattern, text)
-            
-            if not match:
-                continue
-            
-            # Skip if excluded by context (e.g., "reliance retail" shouldn't match "reliance")
-            if is_excluded_by_context(kw, text):
-                continue
-                
-            # Skip if negative context is present (e.g., "college campus" shouldn't match "Campus")
-            if has_negative_context(kw, full_text):
-                continue
-            
-            # Skip generic keywords unless they're part of a longer match
-            if is_generic_keyword(kw):
-                continue
-            
-            # CONFIDENCE SCORING: Need at least 2 of these conditions
-            confidence_signals = 0
-            
-            # Signal 1: Full company name or clear alias (weight 2 — passes threshold alone)
-            if is_full_company_name(kw, company_info["CompanyName"]):
-                confidence_signals += 2
-            
-            # Signal 2: Business/financial action in headline
-            if has_business_action(headline):
-                confidence_signals += 1
-            
-            # Signal 3: Keyword confirmed in content
-            if keyword_in_content(kw, content):
-                confidence_signals += 1
-            
-            # Signal 4: Stock symbol match (very reliable)
-            if kw.upper() == symbol:
-                confidence_signals += 3  # Triple weight for exact symbol match
-            
-            # Require at least 2 confidence signals
-            if confidence_signals < 2:
-                continue
-            
-            # Skip overlapping shorter keywords
-            match_start, match_end = match.start(), match.end()
-            skip = False
-            for prev_kw in matched_keywords:
-                if kw in prev_kw or prev_kw in kw:
-                    prev_pattern = r"\b" + re.escape(prev_kw) + r"\b"
-                    prev_match = re.search(prev_pattern, text)
-                    if prev_match:
-                        if (match_start >= prev_match.start() and match_start < prev_match.end()) or \
-                           (match_end > prev_match.start() and match_end <= prev_match.end()):
-                            skip = True
-                            break
-            
-            if skip:
-                continue
-            
-            tagged_companies.append(company_info.copy())
-            seen_symbols.add(symbol)
-            matched_keywords.add(kw)
-        
-        return tagged_companies
+@lru_cache(maxsize=1)
+def load_keyword_index(mapping_path: str, mtime_ns: int) -> tuple:
+    """Cached build_keyword_index() for a mapping CSV; mtime_ns invalidates on edit."""
+    return build_keyword_index(pd.read_csv(mapping_path))
+
+
+def tag_and_save_articles():
+    index_key = (MAPPING_CSV_PATH, os.stat(MAPPING_CSV_PATH).st_mtime_ns)
 
     # Read from merged_news.json (refreshed each run)
     if not os.path.exists(MERGED_NEWS_PATH):
@@ -269,34 +346,42 @@ def tag_and_save_articles():
     if not articles:
         print("No articles in merged_news.json")
         os.makedirs(os.path.dirname(TAGGED_RECENT_PATH), exist_ok=True)
-        with open(TAGGED_RECENT_PATH, "w", encoding="utf-8") as f_json:
-            json.dump([], f_json, ensure_ascii=False, indent=2)
+        _write_json(TAGGED_RECENT_PATH, [])
         return []
 
     # Load existing tagged data for deduplication using (article_id, symbol) key
     existing_data = []
-    existing_keys = set()  # Composite key: (article_id, symbol)
+    existing_keys = set()  # Composite key: article_id \x00 symbol
     if os.path.exists(TAGGED_OUTPUT_PATH):
         with open(TAGGED_OUTPUT_PATH, "r", encoding="utf-8") as f_old:
             try:
                 existing_data = json.load(f_old)
-                existing_keys = {(item.get("article_id"), item.get("Symbol")) for item in existing_data}
+                existing_keys = {_dedup_key(item.get("article_id"), item.get("Symbol")) for item in existing_data}
             except Exception:
                 existing_data = []
 
+    # Headline-level filters evaluated column-wise: skip macro/sector/analyst
+    # headlines and flag business/financial actions in one pass over the batch
+    articles_df = pd.DataFrame({"headline": [a.get("headline") or "" for a in articles]})
+    headline_lc = articles_df["headline"].astype(str).str.lower()
+    articles_df["skip"] = headline_lc.eq("") | headline_lc.str.contains(SKIP_HEADLINE_PATTERN, regex=True)
+    articles_df["action"] = headline_lc.str.contains(BUSINESS_ACTION_PATTERN, regex=True)
+    candidates = articles_df.loc[~articles_df["skip"], "action"]
+
     tagged_rows = []
-    seen_in_run = set()  # Same-run dedup: (article_id, symbol)
+    seen_in_run = set()  # Same-run dedup: article_id \x00 symbol
     
-    for article in articles:
+    for idx, headline_has_action in candidates.items():
+        article = articles[idx]
         article_id = article.get("article_id", "")
         headline = article.get("headline", "")
         content = article.get("content", "")
-        tagged = tag_companies(headline, content)
+        tagged = tag_companies(headline, content, bool(headline_has_action), index_key)
         
         if tagged:
             for company in tagged:
                 symbol = company["Symbol"]
-                key = (article_id, symbol)
+                key = _dedup_key(article_id, symbol)
                 
                 # Skip if already in cumulative file OR already processed this run
                 if key in existing_keys or key in seen_in_run:
@@ -320,21 +405,26 @@ def tag_and_save_articles():
     if not tagged_rows:
         print("No new companies tagged in this run.")
         os.makedirs(os.path.dirname(TAGGED_RECENT_PATH), exist_ok=True)
-        with open(TAGGED_RECENT_PATH, "w", encoding="utf-8") as f_json:
-            json.dump([], f_json, ensure_ascii=False, indent=2)
+        _write_json(TAGGED_RECENT_PATH, [])
         return []
 
-    # Append to all_tagged_news.json
+    # Append to all_tagged_news.json and save recent tagged (current run only).
+    # The two files are independent, so write them concurrently.
     all_data = existing_data + tagged_rows
-    os.makedirs(os.path.dirname(TAGGED_OUTPUT_PATH), exist_ok=True)
-    with open(TAGGED_OUTPUT_PATH, "w", encoding="utf-8") as f_json:
-        json.dump(all_data, f_json, ensure_ascii=False, indent=2)
+    output_dir = os.path.dirname(TAGGED_OUTPUT_PATH)
+    recent_dir = os.path.dirname(TAGGED_RECENT_PATH)
+    os.makedirs(output_dir, exist_ok=True)
+    if recent_dir != output_dir:
+        os.makedirs(recent_dir, exist_ok=True)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        writes = [
+            executor.submit(_write_json, TAGGED_OUTPUT_PATH, all_data),
+            executor.submit(_write_json, TAGGED_RECENT_PATH, tagged_rows),
+        ]
+        for write in writes:
+            write.result()
     print(f"Updated cumulative tagged file: +{len(tagged_rows)} rows (total: {len(all_data)})")
-
-    # Save recent tagged (current run only)
-    os.makedirs(os.path.dirname(TAGGED_RECENT_PATH), exist_ok=True)
-    with open(TAGGED_RECENT_PATH, "w", encoding="utf-8") as f_recent:
-        json.dump(tagged_rows, f_recent, ensure_ascii=False, indent=2)
     print(f"Recent tagged file: {len(tagged_rows)} rows")
 
     return tagged_rows
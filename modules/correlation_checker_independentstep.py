@@ -1,13 +1,27 @@
 from __future__ import annotations
 
 import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime, timedelta, time
-from typing import List, Dict, Optional, Tuple
+from typing import Iterable, Iterator, List, Dict, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 from zoneinfo import ZoneInfo
 
+# Parquet engine for the migrated OHLCV store (see migrate_ohlcv_parquet.py);
+# without it every day is read from its CSV
+try:
+    import pyarrow  # noqa: F401
+    HAS_PARQUET = True
+except ImportError:
+    HAS_PARQUET = False
+
 DEBUG = True
 def dbg(msg: str):
     if DEBUG:
@@ -26,11 +40,27 @@ SIG_FALLBACK = SIG_DIR / "signals.json"
 DATA_OHLCV_ROOT = ROOT / "correct_ohlcv_tick_data"
 MAP_CSV = ROOT / "correct_ohlcv_tick_data" / "mapping_security_ids.csv"
 OHLCV_BASE = DATA_OHLCV_ROOT / "data_ohlcv"
+OHLCV_PARQUET_DIR = OUT_DIR / "ohlcv_parquet"  # company=<folder>/date=YYYY-MM-DD/part-0.parquet
 
 IST = ZoneInfo("Asia/Kolkata")
 MARKET_OPEN = time(9, 15)
 MARKET_CLOSE = time(15, 30)
 HORIZON_MINUTES_DEFAULT = 60  # as per requirement
+PRICE_INTERVALS_MIN = [2, 5, 10, 15, 20, 30, 45, 60, 90, 120, 180, 240]  # price_after_Xmin fields
+SIDE_BY_SENTIMENT = {"positive": "BUY", "negative": "SELL", "neutral": "HOLD"}
+
+TICK_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"  # as written by new_ohlcv.py
+OHLCV_COLUMNS = {"timestamp", "open", "high", "low", "close", "volume", "hv", "iv"}
+OHLCV_DTYPES = {col: "float64" for col in ("open", "high", "low", "close", "volume")}
+# Optional volatility columns: prices never depend on them, so a stray
+# non-numeric cell becomes NaN instead of failing the whole day file
+OPTIONAL_NUMERIC_COLUMNS = ("hv", "iv")
+NS_PER_MINUTE = 60_000_000_000
+MINUTES_PER_DAY = 24 * 60
+NAIVE_EPOCH = datetime(1970, 1, 1)
+ONE_MICROSECOND = timedelta(microseconds=1)
+VERIFY_WORKERS = os.cpu_count() or 1
+PARALLEL_MIN_GROUPS = 8  # below this many (company, date) groups, evaluate in-process
 
 def _pick_col(df: pd.DataFrame, candidates: List[str]) -> Optional[str]:
     cl = {c.lower(): c for c in df.columns}
@@ -53,122 +83,119 @@ def _load_mapping(map_csv: Path) -> Dict[str, str]:
         raise ValueError(
             f"Mapping CSV must have 'Symbol' and 'CompanyName' columns (found: {list(df.columns)})"
         )
-    mapping = {}
-    for _, row in df.iterrows():
-        sym = str(row[sym_col]).strip().upper()
-        comp = str(row[name_col]).strip()
-        if sym:
-            mapping[sym] = comp
+    syms = df[sym_col].astype(str).str.strip().str.upper().to_numpy()
+    comps = df[name_col].astype(str).str.strip().to_numpy()
+    keep = syms != ""
+    mapping = dict(zip(syms[keep], comps[keep]))
     dbg(f"Loaded mapping: {len(mapping)} symbols from {map_csv}")
     return mapping
 
+@lru_cache(maxsize=None)
 def _normalize_name(s: str) -> str:
     """Loose normalization for matching folder names (ignore case, dots, extra spaces)."""
     return "".join(ch for ch in s.lower() if ch.isalnum() or ch.isspace()).strip()
 
-def _resolve_company_folder(company_name: str) -> Optional[Path]:
+def _build_folder_index() -> Dict[str, Path]:
     """
-    Try to find the company folder under OHLCV_BASE, robust to minor punctuation differences.
+    Scan OHLCV_BASE once per run. Returns exact folder name -> folder, plus
+    normalized folder name -> first folder with that normalization.
     """
     if not OHLCV_BASE.exists():
         dbg(f"OHLCV_BASE does not exist: {OHLCV_BASE}")
-        return None
-    target_norm = _normalize_name(company_name)
-    exact = OHLCV_BASE / company_name
-    if exact.exists():
-        return exact
-    for p in OHLCV_BASE.iterdir():
-        if p.is_dir() and _normalize_name(p.name) == target_norm:
-            return p
-    dbg(f"Could not resolve company folder for '{company_name}' under {OHLCV_BASE}")
-    return None
+        return {}
+    folders = [p for p in OHLCV_BASE.iterdir() if p.is_dir()]
+    index = {p.name: p for p in folders}
+    for p in folders:
+        index.setdefault(_normalize_name(p.name), p)
+    return index
+
+def _resolve_company_folder(company_name: str, folder_index: Dict[str, Path]) -> Optional[Path]:
+    """
+    Try to find the company folder under OHLCV_BASE, robust to minor punctuation differences.
+    """
+    folder = folder_index.get(company_name) or folder_index.get(_normalize_name(company_name))
+    if folder is None:
+        dbg(f"Could not resolve company folder for '{company_name}' under {OHLCV_BASE}")
+    return folder
 
-def _find_csv_for_date(folder: Path, date_ist: datetime) -> Optional[Path]:
+def _find_csv_for_date(folder: Path, date_ist: datetime, csv_index: Dict[Path, Dict[str, Path]]) -> Optional[Path]:
     """
     Files are named like: "<CompanyName> DD-MM-YYYY.csv"
-    We'll match by ending with f" {DD-MM-YYYY}.csv" to avoid issues with company punctuation.
+    We'll match by the trailing f" {DD-MM-YYYY}.csv" to avoid issues with company punctuation.
+    csv_index caches DD-MM-YYYY -> file per folder, globbed on first use.
     """
     date_str = date_ist.strftime("%d-%m-%Y")
-    if not folder or not folder.exists():
+    if not folder:
         return None
-    for f in folder.glob("*.csv"):
-        if f.name.endswith(f" {date_str}.csv"):
-            return f
-    dbg(f"No CSV found in {folder} for date {date_str}")
-    return None
-
-def _parse_ist_time_from_article(article: dict) -> Tuple[Optional[datetime], str]:
+    by_date = csv_index.get(folder)
+    if by_date is None:
+        by_date = {}
+        if folder.exists():
+            for f in folder.glob("*.csv"):
+                # "<name> DD-MM-YYYY.csv": the date is the 10 chars before ".csv"
+                if len(f.name) > 15 and f.name[-15] == " ":
+                    by_date.setdefault(f.name[-14:-4], f)
+        csv_index[folder] = by_date
+    csv_path = by_date.get(date_str)
+    if csv_path is None:
+        dbg(f"No CSV found in {folder} for date {date_str}")
+    return csv_path
+
+# published_time formats seen in scraped articles (all IST wall-clock), keyed by a
+# cheap shape check so the likely format is tried first instead of by exception
+_PUBLISHED_TIME_FORMATS = [
+    # "2026-01-23 14:30:49"
+    (re.compile(r"\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}$"),
+     lambda raw: datetime.strptime(raw, "%Y-%m-%d %H:%M:%S")),
+    # "January 23, 2026/ 15:53 IST" or "January 23, 2026/ 15:53"
+    (re.compile(r"[A-Za-z]+ \d{1,2}, \d{4}/"),
+     lambda raw: datetime.strptime(raw.replace(" IST", "").strip().replace("/", " "), "%B %d, %Y %H:%M")),
+    # "January 23, 2026 at 03:39 PM"
+    (re.compile(r"[A-Za-z]+ \d{1,2}, \d{4} at "),
+     lambda raw: datetime.strptime(raw, "%B %d, %Y at %I:%M %p")),
+    # "03:56 PM | 23 Jan 2026"
+    (re.compile(r"\d{1,2}:\d{2} [AaPp][Mm] \| "),
+     lambda raw: datetime.strptime(raw, "%I:%M %p | %d %b %Y")),
+]
+
+@lru_cache(maxsize=4096)
+def _parse_published_time(raw: str) -> Optional[datetime]:
     """
-    Parse published_time from news article.
+    Parse a stripped published_time string from a news article.
     Handles multiple formats:
     - "January 23, 2026/ 15:53 IST"
     - "January 23, 2026 at 03:39 PM"
     - "03:56 PM | 23 Jan 2026"
-    Floor to minute.
-    Returns (dt_ist, source_str).
+    Returns an IST datetime floored to the minute, or None.
     """
-    if "published_time" not in article or not article["published_time"]:
-        return None, "none"
-    
-    raw = str(article["published_time"]).strip()
-    
-    # Try format: "2026-01-23 14:30:49" (ISO datetime format)
-    try:
-        dt = datetime.strptime(raw, "%Y-%m-%d %H:%M:%S")
-        dt = dt.replace(tzinfo=IST, second=0, microsecond=0)
-        return dt, "published_time"
-    except Exception:
-        pass
-    
-    # Try format: "January 23, 2026/ 15:53 IST" or "January 23, 2026/ 15:53"
-    try:
-        # Remove "IST" if present
-        clean = raw.replace(" IST", "").strip()
-        # Replace / with space
-        clean = clean.replace("/", " ")
-        dt = datetime.strptime(clean, "%B %d, %Y %H:%M")
-        dt = dt.replace(tzinfo=IST, second=0, microsecond=0)
-        return dt, "published_time"
-    except Exception:
-        pass
-    
-    # Try format: "January 23, 2026 at 03:39 PM"
-    try:
-        dt = datetime.strptime(raw, "%B %d, %Y at %I:%M %p")
-        dt = dt.replace(tzinfo=IST, second=0, microsecond=0)
-        return dt, "published_time"
-    except Exception:
-        pass
-    
-    # Try format: "03:56 PM | 23 Jan 2026"
-    try:
-        dt = datetime.strptime(raw, "%I:%M %p | %d %b %Y")
-        dt = dt.replace(tzinfo=IST, second=0, microsecond=0)
-        return dt, "published_time"
-    except Exception:
-        pass
+    # Shape-matched format first, then the rest in order (formats are disjoint)
+    ordered = sorted(_PUBLISHED_TIME_FORMATS, key=lambda entry: entry[0].match(raw) is None)
+    for _, parse in ordered:
+        try:
+            return parse(raw).replace(tzinfo=IST, second=0, microsecond=0)
+        except Exception:
+            pass
     
     # Try ISO format as fallback
     try:
-        if raw.endswith("Z"):
-            raw = raw[:-1] + "+00:00"
-        dt_utc = datetime.fromisoformat(raw)
-        dt_ist = dt_utc.astimezone(IST).replace(second=0, microsecond=0)
-        return dt_ist, "published_time"
+        iso = raw[:-1] + "+00:00" if raw.endswith("Z") else raw
+        dt_utc = datetime.fromisoformat(iso)
+        return dt_utc.astimezone(IST).replace(second=0, microsecond=0)
     except Exception as e:
-        dbg(f"Failed to parse published_time='{article.get('published_time')}' ({e})")
-    
-    return None, "none"
-
-def _market_window_ok(t_ist: datetime, horizon_min: int) -> bool:
-    if t_ist.tzinfo is None:
-        return False
-    if not (MARKET_OPEN <= t_ist.timetz().replace(tzinfo=None) <= MARKET_CLOSE):
-        return False
-    t2 = t_ist + timedelta(minutes=horizon_min)
-    if not (MARKET_OPEN <= t2.timetz().replace(tzinfo=None) <= MARKET_CLOSE):
-        return False
-    return True
+        dbg(f"Failed to parse published_time='{raw}' ({e})")
+    return None
+
+def _parse_tick_timestamps(raw: pd.Series) -> pd.Series:
+    """Parse a tick timestamp column to naive IST datetimes."""
+    # Parse once with the collector's fixed format (no per-row format inference);
+    # fall back to inference for files written by other tools
+    try:
+        ts = pd.to_datetime(raw, format=TICK_TIMESTAMP_FORMAT, cache=True)
+    except (ValueError, TypeError):
+        ts = pd.to_datetime(raw)
+    if ts.dt.tz is not None:
+        ts = ts.dt.tz_convert(IST).dt.tz_localize(None)
+    return ts
 
 def _canonicalize_minute_bars(day_df: pd.DataFrame) -> pd.DataFrame:
     """
@@ -179,7 +206,8 @@ def _canonicalize_minute_bars(day_df: pd.DataFrame) -> pd.DataFrame:
       - close = last
       - volume = sum
       - hv/iv = last
-    Assumes timestamps are in IST (naive or aware).
+    Assumes timestamps are in IST (naive or aware); the result is indexed by
+    naive IST minutes.
     """
     if day_df.empty:
         return day_df
@@ -187,117 +215,202 @@ def _canonicalize_minute_bars(day_df: pd.DataFrame) -> pd.DataFrame:
     if "timestamp" not in day_df.columns:
         return pd.DataFrame()
 
-    ts = pd.to_datetime(day_df["timestamp"])
-    if ts.dt.tz is None:
-        ts = ts.dt.tz_localize(IST)
-    day_df = day_df.assign(_ts=ts).sort_values("_ts")
-    minute = day_df["_ts"].dt.floor("T")
-
-    agg = {
-        "open": "first",
-        "high": "max",
-        "low": "min",
-        "close": "last",
-        "volume": "sum",
+    ts = _parse_tick_timestamps(day_df["timestamp"])
+
+    # Work on naive-IST int64 nanoseconds: sort, then floor to the minute arithmetically
+    valid = ts.notna().to_numpy()
+    ts_i8 = ts.to_numpy(dtype="datetime64[ns]").view("i8")[valid]
+    order = np.argsort(ts_i8, kind="stable")
+    day_df = day_df.loc[valid].iloc[order]
+    minute_i8 = ts_i8[order] // NS_PER_MINUTE * NS_PER_MINUTE
+
+    reducers = {
+        "open": _first_valid,
+        "high": lambda v, s: np.fmax.reduceat(v, s),
+        "low": lambda v, s: np.fmin.reduceat(v, s),
+        "close": _last_valid,
+        "volume": lambda v, s: np.add.reduceat(np.nan_to_num(v), s),
+        "hv": _last_valid,
+        "iv": _last_valid,
     }
-    if "hv" in day_df.columns:
-        agg["hv"] = "last"
-    if "iv" in day_df.columns:
-        agg["iv"] = "last"
-
-    grouped = day_df.assign(minute=minute).groupby("minute", as_index=False).agg(agg)
-    grouped = grouped.sort_values("minute").set_index("minute")
+    # No parseable timestamp: reduceat cannot take an empty index array
+    if not len(minute_i8):
+        return pd.DataFrame(columns=[c for c in reducers if c in day_df.columns])
+
+    # Minutes are sorted, so each group is a contiguous run of equal keys
+    starts = np.flatnonzero(np.r_[True, minute_i8[1:] != minute_i8[:-1]])
+
+    grouped = pd.DataFrame(
+        {
+            col: reduce(day_df[col].to_numpy(dtype="float64"), starts)
+            for col, reduce in reducers.items()
+            if col in day_df.columns
+        },
+        index=pd.DatetimeIndex(minute_i8[starts].astype("datetime64[ns]"), name="minute"),
+    )
     return grouped
 
-def _get_close_at(df_min: pd.DataFrame, minute_ts: datetime, allow_tolerance: bool = True) -> Optional[float]:
+def _first_valid(values: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    """First non-NaN value per run (NaN if the whole run is NaN), like groupby 'first'."""
+    pos = np.arange(len(values))
+    first = np.minimum.reduceat(np.where(np.isnan(values), len(values), pos), starts)
+    ends = np.r_[starts[1:], len(values)]
+    return np.where(first < ends, values[np.minimum(first, len(values) - 1)], np.nan)
+
+def _last_valid(values: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    """Last non-NaN value per run (NaN if the whole run is NaN), like groupby 'last'."""
+    pos = np.arange(len(values))
+    last = np.maximum.reduceat(np.where(np.isnan(values), -1, pos), starts)
+    return np.where(last >= starts, values[np.maximum(last, 0)], np.nan)
+
+@dataclass(frozen=True, slots=True)
+class DayBars:
     """
-    Get close at the given minute. If not present and tolerance is allowed,
-    try minute + 1 minute (handles occasional gaps).
+    Minute bars of one company/day as parallel numpy arrays, sorted by minute.
+    minute_i8 holds naive-IST epoch nanoseconds (wall-clock IST read as UTC).
     """
-    if df_min.empty:
-        return None
-    key = pd.Timestamp(minute_ts).tz_convert(IST) if minute_ts.tzinfo else pd.Timestamp(minute_ts, tz=IST)
-    if key in df_min.index:
-        val = df_min.loc[key, "close"]
-        return float(val) if pd.notna(val) else None
-    if allow_tolerance:
-        key2 = key + pd.Timedelta(minutes=1)
-        if key2 in df_min.index:
-            val = df_min.loc[key2, "close"]
-            return float(val) if pd.notna(val) else None
-    return None
+    minute_i8: np.ndarray
+    close: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+
+    @classmethod
+    def from_frame(cls, df_min: pd.DataFrame) -> "DayBars":
+        return cls(
+            minute_i8=df_min.index.asi8,
+            close=df_min["close"].to_numpy(),
+            high=df_min["high"].to_numpy(),
+            low=df_min["low"].to_numpy(),
+        )
+
+def _parquet_path_for(csv_path: Path) -> Path:
+    """Location of a "<Company> DD-MM-YYYY.csv" day in the Parquet store."""
+    day, month, year = csv_path.name[-14:-4].split("-")
+    return OHLCV_PARQUET_DIR / f"company={csv_path.parent.name}" / f"date={year}-{month}-{day}" / "part-0.parquet"
 
-def _get_price_at_signal(df_min: pd.DataFrame, signal_time: datetime) -> Tuple[Optional[float], bool]:
+def _day_source(csv_path: Path) -> Tuple[str, int]:
     """
-    Get the CLOSE price at signal time with the following logic:
-    1. First, try to get the last available CLOSE at or before signal_time
-    2. If none exists, look forward within 15 minutes for the first CLOSE
-    3. Never use OPEN prices
-    4. Return (price, is_fallback) where is_fallback indicates if forward search was used
+    Pick the file to load for a day: its migrated Parquet partition when the
+    engine is available and the partition is at least as new as the CSV (days
+    still being collected keep using the CSV), else the CSV. Returns (path, mtime_ns).
     """
-    if df_min.empty:
-        return None, False
-    
-    signal_key = pd.Timestamp(signal_time).tz_convert(IST) if signal_time.tzinfo else pd.Timestamp(signal_time, tz=IST)
-    
-    # Try exact match first
-    if signal_key in df_min.index:
-        val = df_min.loc[signal_key, "close"]
-        if pd.notna(val):
-            return float(val), False
-    
-    # Try backward search: find the last CLOSE at or before signal_time
-    before_mask = df_min.index <= signal_key
-    before_data = df_min.loc[before_mask]
-    if not before_data.empty:
-        # Get the last row (most recent before signal)
-        last_close = before_data.iloc[-1]["close"]
-        if pd.notna(last_close):
-            return float(last_close), False
-    
-    # Forward fallback: search within 15 minutes for first CLOSE
-    end_key = signal_key + pd.Timedelta(minutes=15)
-    forward_mask = (df_min.index > signal_key) & (df_min.index <= end_key)
-    forward_data = df_min.loc[forward_mask]
-    
-    if not forward_data.empty:
-        # Get the first row after signal (within 15 min tolerance)
-        first_close = forward_data.iloc[0]["close"]
-        if pd.notna(first_close):
-            return float(first_close), True  # Mark as fallback
-    
-    return None, False
-
-def _get_price_after(df_min: pd.DataFrame, target_time: datetime, tolerance_minutes: int = 10) -> Optional[float]:
+    csv_mtime = os.stat(csv_path).st_mtime_ns
+    if HAS_PARQUET:
+        pq_path = _parquet_path_for(csv_path)
+        try:
+            pq_mtime = os.stat(pq_path).st_mtime_ns
+        except OSError:
+            pq_mtime = -1
+        if pq_mtime >= csv_mtime:
+            return str(pq_path), pq_mtime
+    return str(csv_path), csv_mtime
+
+def _read_day_csv(csv_path_str: str) -> pd.DataFrame:
+    """Read a per-day OHLCV CSV: only the columns we aggregate, with fixed OHLCV dtypes."""
+    day_df = pd.read_csv(
+        csv_path_str,
+        usecols=lambda col: col in OHLCV_COLUMNS,
+        dtype=OHLCV_DTYPES,
+        engine="c",
+    )
+    for col in OPTIONAL_NUMERIC_COLUMNS:
+        if col in day_df.columns and day_df[col].dtype.kind != "f":
+            day_df[col] = pd.to_numeric(day_df[col], errors="coerce")
+    return day_df
+
+@lru_cache(maxsize=512)
+def _load_day_minutes(day_path_str: str, mtime_ns: int) -> Tuple[Optional[DayBars], Optional[str]]:
     """
-    Get the first available CLOSE price at or AFTER the target time.
-    Forward-only search with tolerance.
-    
-    Args:
-        df_min: DataFrame with minute bars indexed by timestamp
-        target_time: The target time to search from
-        tolerance_minutes: Maximum minutes to search forward (default: 10)
-    
-    Returns:
-        First CLOSE price found at or after target_time within tolerance, or None
+    Read a per-day OHLCV CSV (or its Parquet partition) and canonicalize it to
+    minute bars. Cached per (path, mtime_ns) so articles sharing a symbol/day
+    parse the file once, while a rewritten file gets a fresh entry.
+    Returns (bars, reason_if_failed); the cached arrays must not be mutated.
     """
+    if day_path_str.endswith(".parquet"):
+        try:
+            day_df = pd.read_parquet(day_path_str)
+        except Exception:
+            return None, "PARQUET_READ_FAIL"
+    else:
+        try:
+            day_df = _read_day_csv(day_path_str)
+        except Exception:
+            return None, "CSV_READ_FAIL"
+
+    for col in ["timestamp", "open", "high", "low", "close", "volume"]:
+        if col not in day_df.columns:
+            return None, "MISSING_COLUMNS"
+
+    df_min = _canonicalize_minute_bars(day_df)
     if df_min.empty:
-        return None
-    
-    target_key = pd.Timestamp(target_time).tz_convert(IST) if target_time.tzinfo else pd.Timestamp(target_time, tz=IST)
-    end_key = target_key + pd.Timedelta(minutes=tolerance_minutes)
-    
-    # Forward-only search: at or after target, within tolerance
-    forward_mask = (df_min.index >= target_key) & (df_min.index <= end_key)
-    forward_data = df_min.loc[forward_mask]
-    
-    if not forward_data.empty:
-        # Get the first row at or after target time
-        first_close = forward_data.iloc[0]["close"]
-        if pd.notna(first_close):
-            return float(first_close)
-    
-    return None
+        return None, "NO_DATA_AFTER_CANON"
+    return DayBars.from_frame(df_min), None
+
+def _ist_ns(t: datetime) -> int:
+    """Naive-IST epoch nanoseconds of a datetime; naive values are taken as IST."""
+    if t.tzinfo is not None:
+        t = t.astimezone(IST).replace(tzinfo=None)  # no-op conversion for IST-tagged values
+    return (t - NAIVE_EPOCH) // ONE_MICROSECOND * 1000
+
+def _compute_metrics(
+    bars: DayBars,
+    signal_keys: np.ndarray,
+    intervals: List[int],
+    tolerance_minutes: int = 10,
+    fallback_minutes: int = 15,
+) -> Dict[str, np.ndarray]:
+    """
+    Price metrics for several signals on the same day in one pass over the bars.
+      p0, p0_fallback : CLOSE at signal time - the last CLOSE at or before it, else
+                        (fallback) the first CLOSE within `fallback_minutes` after it.
+                        Never uses OPEN prices.
+      prices          : (signals, intervals) first CLOSE at or after t + interval,
+                        forward-only within `tolerance_minutes`
+      highest, lowest : max HIGH / min LOW over [t, t + max(intervals)]
+    Missing values are NaN.
+    """
+    minute, close = bars.minute_i8, bars.close
+    n = len(minute)
+    keys = np.asarray(signal_keys, dtype="int64")
+    nan = np.full(len(keys), np.nan)
+    if n == 0:
+        return {
+            "p0": nan, "p0_fallback": np.zeros(len(keys), dtype=bool),
+            "prices": np.full((len(keys), len(intervals)), np.nan),
+            "highest": nan, "lowest": nan,
+        }
+
+    # Backward search (includes an exact match), then forward fallback
+    after = minute.searchsorted(keys, side="right")
+    back = close[np.maximum(after - 1, 0)]
+    back_ok = (after > 0) & ~np.isnan(back)
+    ahead = np.minimum(after, n - 1)
+    fwd = close[ahead]
+    fwd_ok = ~back_ok & (after < n) & (minute[ahead] <= keys + fallback_minutes * NS_PER_MINUTE) & ~np.isnan(fwd)
+    p0 = np.where(back_ok, back, np.where(fwd_ok, fwd, np.nan))
+
+    # All price_after_Xmin targets of all signals in one searchsorted
+    targets = keys[:, None] + np.asarray(intervals, dtype="int64")[None, :] * NS_PER_MINUTE
+    pos = minute.searchsorted(targets, side="left")
+    at = np.minimum(pos, n - 1)
+    hit = (pos < n) & (minute[at] <= targets + tolerance_minutes * NS_PER_MINUTE)
+    prices = np.where(hit, close[at], np.nan)
+
+    # High/low over the tracking window: a contiguous slice [lo, hi) per signal.
+    # reduceat over interleaved (lo, hi) pairs reduces every slice in one call
+    # (even outputs); fmax/fmin skip NaN, so an all-NaN slice stays NaN. A NaN
+    # sentinel keeps hi == n a valid index.
+    lo = minute.searchsorted(keys, side="left")
+    hi = minute.searchsorted(keys + max(intervals) * NS_PER_MINUTE, side="right")
+    bounds = np.column_stack([lo, hi]).ravel()
+    has_bars = lo < hi
+    highest = np.where(has_bars, np.fmax.reduceat(np.append(bars.high, np.nan), bounds)[::2], np.nan)
+    lowest = np.where(has_bars, np.fmin.reduceat(np.append(bars.low, np.nan), bounds)[::2], np.nan)
+
+    return {"p0": p0, "p0_fallback": fwd_ok, "prices": prices, "highest": highest, "lowest": lowest}
+
+def _round_price(value: float) -> Optional[float]:
+    return None if np.isnan(value) else round(float(value), 2)
 
 def _load_signals() -> tuple[list[dict], Path]:
     """
@@ -318,120 +431,102 @@ def _load_signals() -> tuple[list[dict], Path]:
 
 
 
-def _get_multiple_prices(df_min: pd.DataFrame, t_ist: datetime, intervals: List[int]) -> Dict[str, Optional[float]]:
-    """
-    Get prices at multiple intervals after the signal time.
-    Uses forward-only search with 10-minute tolerance for each interval.
+def _prepare_signals(signals: List[dict], sym2company: Dict[str, str], horizon_min: int) -> pd.DataFrame:
     """
-    prices = {}
-    for interval in intervals:
-        target_time = t_ist + timedelta(minutes=interval)
-        price = _get_price_after(df_min, target_time, tolerance_minutes=10)
-        if price is not None:
-            prices[f"price_after_{interval}min"] = round(price, 2)
-        else:
-            prices[f"price_after_{interval}min"] = None
-    return prices
-
-
-def _get_price_range(df_min: pd.DataFrame, t_ist: datetime, max_interval: int) -> Tuple[Optional[float], Optional[float]]:
+    Columnar pre-pass over all articles: normalize symbol/sentiment, map side
+    and company, parse each distinct published_time once and apply the market
+    window. Returns one row per signal; `reason` is None for rows that still
+    need price data.
     """
-    Get highest and lowest prices within the tracking period
-    """
-    if df_min.empty:
-        return None, None
-    
-    start_key = pd.Timestamp(t_ist).tz_convert(IST) if t_ist.tzinfo else pd.Timestamp(t_ist, tz=IST)
-    end_time = t_ist + timedelta(minutes=max_interval)
-    end_key = pd.Timestamp(end_time).tz_convert(IST) if end_time.tzinfo else pd.Timestamp(end_time, tz=IST)
-    
-    # Filter data within the time range
-    mask = (df_min.index >= start_key) & (df_min.index <= end_key)
-    range_data = df_min.loc[mask]
-    
-    if range_data.empty:
-        return None, None
-    
-    highest = round(float(range_data["high"].max()), 2) if not range_data["high"].isna().all() else None
-    lowest = round(float(range_data["low"].min()), 2) if not range_data["low"].isna().all() else None
-    
-    return highest, lowest
+    arts = pd.DataFrame({
+        "sym": [str(a.get("Symbol", "")) for a in signals],
+        "sentiment": [str(a.get("sentiment", "")) for a in signals],
+    }, dtype=object)
+    arts["sym"] = arts["sym"].str.strip().str.upper()
+    arts["sentiment"] = arts["sentiment"].str.strip().str.lower()
+    arts["side"] = arts["sentiment"].map(SIDE_BY_SENTIMENT)
+    arts["company"] = arts["sym"].map(sym2company).fillna("")
+
+    raw_times = [a.get("published_time") for a in signals]
+    parsed = {
+        raw: _parse_published_time(str(raw).strip())
+        for raw in dict.fromkeys(raw for raw in raw_times if raw)
+    }
+    arts["t_ist"] = pd.Series([parsed[raw] if raw else None for raw in raw_times], dtype=object)
+
+    # Market window on naive-IST minute-of-day: both t and t + horizon within [open, close]
+    t_key = np.array([_ist_ns(t) if t is not None else 0 for t in arts["t_ist"]], dtype="int64")
+    minute_of_day = t_key // NS_PER_MINUTE % MINUTES_PER_DAY
+    end_minute = (minute_of_day + horizon_min) % MINUTES_PER_DAY
+    open_min = MARKET_OPEN.hour * 60 + MARKET_OPEN.minute
+    close_min = MARKET_CLOSE.hour * 60 + MARKET_CLOSE.minute
+    in_window = (
+        (minute_of_day >= open_min) & (minute_of_day <= close_min)
+        & (end_minute >= open_min) & (end_minute <= close_min)
+    )
+
+    arts["reason"] = np.select(
+        [
+            (arts["sym"] == "").to_numpy(),
+            arts["side"].isna().to_numpy(),
+            arts["t_ist"].isna().to_numpy(),
+            ~in_window,
+            (arts["company"] == "").to_numpy(),
+        ],
+        np.array(["NO_SYMBOL", "INVALID_SENTIMENT", "TIME_PARSE_FAIL", "OUT_OF_MARKET", "NO_MAPPING"], dtype=object),
+        default=None,
+    )
+    return arts
+
+def _load_bars_for(
+    company: str,
+    t_ist: datetime,
+    folder_index: Dict[str, Path],
+    csv_index: Dict[Path, Dict[str, Path]],
+) -> Tuple[Optional[DayBars], Optional[str]]:
+    """Resolve and load the minute bars of a company on the signal's IST date."""
+    folder = _resolve_company_folder(company, folder_index)
+    if not folder:
+        return None, "NO_FOLDER"
 
+    csv_path = _find_csv_for_date(folder, t_ist, csv_index)
+    if not csv_path or not csv_path.exists():
+        return None, f"NO_CSV:{folder.name}"
 
+    return _load_day_minutes(*_day_source(csv_path))
 
 def _evaluate_signal(
     article: dict,
-    sym2company: Dict[str, str],
-    horizon_min: int,
+    sym: str,
+    sentiment: str,
+    side: str,
+    t_ist: datetime,
+    metrics: Dict[str, np.ndarray],
+    row: int,
 ) -> Tuple[Optional[dict], Optional[str]]:
     """
-    Process a news article and calculate correlation metrics.
+    Build the correlation entry of one article from row `row` of _compute_metrics.
     Returns (output_dict, reason_if_skipped).
     """
-    sym = str(article.get("Symbol", "")).strip().upper()
-    sentiment = str(article.get("sentiment", "")).strip().lower()
-    
-    if not sym:
-        return None, "NO_SYMBOL"
-    
-    # Map sentiment to signal: positive=BUY, negative=SELL, neutral=HOLD
-    if sentiment == "positive":
-        side = "BUY"
-    elif sentiment == "negative":
-        side = "SELL"
-    elif sentiment == "neutral":
-        side = "HOLD"
-    else:
-        return None, "INVALID_SENTIMENT"
-
-    t_ist, time_src = _parse_ist_time_from_article(article)
-    if t_ist is None:
-        return None, "TIME_PARSE_FAIL"
-    dbg(f"Article {sym} {sentiment} at {t_ist.strftime('%Y-%m-%d %H:%M')} (source={time_src})")
-
-    if not _market_window_ok(t_ist, horizon_min):
-        return None, "OUT_OF_MARKET"
-
-    company = sym2company.get(sym)
-    if not company:
-        return None, "NO_MAPPING"
-
-    folder = _resolve_company_folder(company)
-    if not folder:
-        return None, "NO_FOLDER"
-
-    csv_path = _find_csv_for_date(folder, t_ist)
-    if not csv_path or not csv_path.exists():
-        return None, f"NO_CSV:{folder.name}"
-
-    try:
-        day_df = pd.read_csv(csv_path)
-    except Exception:
-        return None, "CSV_READ_FAIL"
-
-    for col in ["timestamp", "open", "high", "low", "close", "volume"]:
-        if col not in day_df.columns:
-            return None, "MISSING_COLUMNS"
-
-    df_min = _canonicalize_minute_bars(day_df)
-    if df_min.empty:
-        return None, "NO_DATA_AFTER_CANON"
-
-    # Updated intervals to include 20 and 90 minutes
-    intervals = [2, 5, 10, 15, 20, 30, 45, 60, 90, 120, 180, 240]
-    price_data = _get_multiple_prices(df_min, t_ist, intervals)
+    intervals = PRICE_INTERVALS_MIN
+    price_data = {
+        f"price_after_{interval}min": _round_price(price)
+        for interval, price in zip(intervals, metrics["prices"][row])
+    }
 
-    # Get price at signal using new logic: backward search first, then forward fallback
-    p0, is_fallback = _get_price_at_signal(df_min, t_ist)
-    if p0 is None:
+    # Price at signal: backward search first, then forward fallback
+    if np.isnan(metrics["p0"][row]):
         return None, "MISSING_PRICE_T"
+    p0 = float(metrics["p0"][row])
+    is_fallback = bool(metrics["p0_fallback"][row])
 
     p1 = price_data.get("price_after_60min")
     if p1 is None:
         return None, "MISSING_PRICE_TPLUS_1HOUR"
     
-    # Get price range (highest and lowest)
-    highest, lowest = _get_price_range(df_min, t_ist, max(intervals))
+    # Price range (highest and lowest)
+    highest = _round_price(metrics["highest"][row])
+    lowest = _round_price(metrics["lowest"][row])
     
     # Calculate percent change
     percent_change = round(((p1 - p0) / p0) * 100, 2) if p0 != 0 else 0.0
@@ -452,7 +547,7 @@ def _evaluate_signal(
         "url": article.get("url", ""),
         "stock": sym,
         "sentiment": sentiment,
-        "price_at_signal": round(float(p0), 2),
+        "price_at_signal": round(p0, 2),
         "price_at_signal_is_fallback": is_fallback,
         **price_data,  # Add all price_after_Xmin fields
         "highest_price": highest,
@@ -463,6 +558,82 @@ def _evaluate_signal(
     return out, None
 
 
+_WORKER_FOLDER_INDEX: Dict[str, Path] = {}
+_WORKER_CSV_INDEX: Dict[Path, Dict[str, Path]] = {}
+
+def _init_worker(folder_index: Dict[str, Path]) -> None:
+    """
+    Pool initializer: ship the folder index to each worker once, not per task,
+    and start the worker's CSV index for this run (shared by all its groups).
+    """
+    global _WORKER_FOLDER_INDEX, _WORKER_CSV_INDEX
+    _WORKER_FOLDER_INDEX = folder_index
+    _WORKER_CSV_INDEX = {}
+
+def _evaluate_group(tasks: List[Tuple[int, tuple]]) -> List[Tuple[int, Optional[dict], Optional[str]]]:
+    """
+    Evaluate all articles of one (company, date) group, so the day CSV is
+    loaded at most once per worker. Returns (position, output, reason) per task.
+    """
+    # Every article in the group shares the company and date, hence the CSV
+    _, (_, _, _, _, t_ist, company) = tasks[0]
+    bars, reason = _load_bars_for(company, t_ist, _WORKER_FOLDER_INDEX, _WORKER_CSV_INDEX)
+    if bars is None:
+        return [(pos, None, reason) for pos, _ in tasks]
+
+    metrics = _compute_metrics(bars, [_ist_ns(args[4]) for _, args in tasks], PRICE_INTERVALS_MIN)
+    return [
+        (pos, *_evaluate_signal(*args[:5], metrics=metrics, row=row))
+        for row, (pos, args) in enumerate(tasks)
+    ]
+
+def _in_position_order(
+    positions: List[int],
+    group_results: Iterable[List[Tuple[int, Optional[dict], Optional[str]]]],
+) -> Iterator[Tuple[int, Optional[dict], Optional[str]]]:
+    """
+    Re-sequence per-group results into position order as they arrive. A result
+    is held only until every earlier position has been yielded; groups are
+    submitted in order of their first position, so that backlog stays small.
+    """
+    ready: Dict[int, Tuple[Optional[dict], Optional[str]]] = {}
+    upcoming = iter(positions)
+    nxt = next(upcoming, None)
+    for results in group_results:
+        for pos, out, reason in results:
+            ready[pos] = (out, reason)
+        while nxt is not None and nxt in ready:
+            yield (nxt, *ready.pop(nxt))
+            nxt = next(upcoming, None)
+
+def _evaluate_pending(arts: pd.DataFrame, signals: List[dict], folder_index: Dict[str, Path]) -> Iterator[Tuple[int, Optional[dict], Optional[str]]]:
+    """
+    Run the file/price stage for every row _prepare_signals left unresolved,
+    grouped by (company, date) and spread over a process pool when there are
+    enough groups to pay for the worker start-up.
+    Yields (position, output, reason) for those rows lazily, in position order,
+    so the caller can write each entry as soon as it and its predecessors are done.
+    """
+    groups: Dict[Tuple[str, object], List[Tuple[int, tuple]]] = {}
+    positions: List[int] = []
+    for pos, row in enumerate(arts.itertuples(index=False)):
+        if row.reason is None:
+            args = (signals[pos], row.sym, row.sentiment, row.side, row.t_ist, row.company)
+            groups.setdefault((row.company, row.t_ist.date()), []).append((pos, args))
+            positions.append(pos)
+
+    if len(groups) < PARALLEL_MIN_GROUPS or VERIFY_WORKERS < 2:
+        _init_worker(folder_index)
+        yield from _in_position_order(positions, map(_evaluate_group, groups.values()))
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=min(VERIFY_WORKERS, len(groups)),
+        initializer=_init_worker,
+        initargs=(folder_index,),
+    ) as pool:
+        yield from _in_position_order(positions, pool.map(_evaluate_group, groups.values()))
+
 def verify(signals: List[dict], t0_iso: Optional[str] = None, horizon: str = "5m") -> Dict[str, object]:
     """
     Verify a list of signals and write a single JSON:
@@ -483,31 +654,44 @@ def verify(signals: List[dict], t0_iso: Optional[str] = None, horizon: str = "5m
     dbg(f"HORIZON_MINUTES={horizon_min}")
 
     sym2company = _load_mapping(MAP_CSV)
+    folder_index = _build_folder_index()
 
-    results: List[dict] = []
-    processed = skipped = 0
-
-    for article in signals:
-        processed += 1
-        # Extract sym and sentiment before any usage
-        sym = str(article.get("Symbol", "")).strip().upper()
-        sentiment = str(article.get("sentiment", "")).strip()
-        
-        out, reason = _evaluate_signal(article, sym2company, horizon_min=horizon_min)
-        if out is None:
-            skipped += 1
-            if DEBUG or sym == "ADANIGREEN":
-                print(f"[correlation_checker][SKIP] {sym} {sentiment} → {reason}")
-            continue
-        results.append(out)
+    processed = skipped = written = 0
 
+    # Stream entries into the same indented JSON list json.dump would produce as
+    # _evaluate_pending yields them (only out-of-order group results are held),
+    # via a temp file so a failed run leaves the previous output intact
     out_path = CORR_DIR / "correlation_latest.json"
-    with open(out_path, "w", encoding="utf-8") as f:
-        json.dump(results, f, ensure_ascii=False, indent=2)
+    tmp_path = out_path.with_suffix(".json.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        arts = _prepare_signals(signals, sym2company, horizon_min)
+        evaluated = _evaluate_pending(arts, signals, folder_index)
+        for pos, (article, row) in enumerate(zip(signals, arts.itertuples(index=False))):
+            processed += 1
+            sym = row.sym
+            sentiment = str(article.get("sentiment", "")).strip()
+            
+            if row.reason in (None, "OUT_OF_MARKET", "NO_MAPPING"):
+                dbg(f"Article {sym} {row.sentiment} at {row.t_ist.strftime('%Y-%m-%d %H:%M')} (source=published_time)")
+            if row.reason is None:
+                # Pending rows come back from _evaluate_pending in this same order
+                _, out, reason = next(evaluated)
+            else:
+                out, reason = None, row.reason
+            if out is None:
+                skipped += 1
+                if DEBUG or sym == "ADANIGREEN":
+                    print(f"[correlation_checker][SKIP] {sym} {sentiment} → {reason}")
+                continue
+            f.write("[\n  " if written == 0 else ",\n  ")
+            f.write(json.dumps(out, ensure_ascii=False, indent=2).replace("\n", "\n  "))
+            written += 1
+        f.write("\n]" if written else "[]")
+    os.replace(tmp_path, out_path)
 
     summary = {
         "sample_size": processed,
-        "written": len(results),
+        "written": written,
         "skipped": skipped,
         "horizon_minutes": horizon_min,
         "output_file": str(out_path),
@@ -0,0 +1,312 @@
+"""
+Cumulative Store Module
+
+Append-with-dedup for the cumulative all_*.json outputs and the scrapers' raw stores.
+The stores stay one indented JSON list, byte-identical to
+json.dump(rows, indent=indent, ensure_ascii=False), but an append no longer
+re-reads and re-serializes the whole list:
+- dedup keys live in a sidecar next to the store: one JSON-encoded key per
+  line, plus "#<version> <size> <mtime_ns> <rows>" stamp lines recording the
+  state of the store the keys describe
+- a lookup streams the sidecar looking only for the new rows' keys, so
+  memory stays proportional to the batch, not to the store
+- once a process has appended to a store (main.py's loop runs again and
+  again), its next lookup loads that store's keys into an in-process set,
+  kept current by each append, so later runs check keys in memory without
+  touching the sidecar. That trades memory for I/O: the set lives as long
+  as the process and holds every key of the store, so stores with more
+  than KEY_CACHE_MAX_KEYS keys are never cached and keep streaming
+- new rows are written over the closing "]" in place
+
+append_unique dedups on one composite key per row ("<all_path>.keys").
+append_unseen implements the scrapers' rule instead: every field is its own
+key space (a row's url may match one stored row and its article_id another),
+so its sidecar ("<all_path>.fieldkeys") holds one "[field, value]" line per
+field per row. Each scheme keeps its own sidecar, so a store written through
+both (the Moneycontrol/LiveMint raw stores are also Step 1's all_*.json) stays
+correct: an append through one scheme leaves the other's stamp stale.
+
+If the last stamp does not match the store (first run, the store was
+rewritten by something else or appended through the other scheme) the key
+index is rebuilt from the store once.
+"""
+
+import json
+import os
+from typing import Callable, Dict, List, Sequence, Set, Tuple
+
+# Optional: orjson parses the stores ~3x faster; store writes stay on json so
+# the indent=4 layout (and NaN round-trips) are unchanged
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+INDENT = 4  # default layout; the news fetcher's stores use 2
+TAIL_BYTES = 4096  # enough to find the closing "]" behind trailing whitespace
+
+KEY_CACHE_MAX_KEYS = 500_000  # larger stores are streamed on every lookup
+
+UNIQUE_INDEX_SUFFIX = ".keys"  # append_unique / filter_stored
+FIELD_INDEX_SUFFIX = ".fieldkeys"  # append_unseen
+# Stamps written before the sidecars were split by scheme carry no version
+# and read as stale, so a .keys file that mixed both schemes gets rebuilt
+KEY_INDEX_VERSION = 2
+
+# index_path -> ((size, mtime_ns) of the store, its sidecar keys, its row count)
+_KEY_CACHE: Dict[str, Tuple[Tuple[int, int], Set[str], int]] = {}
+# Sidecars whose store this process has appended to: only these get a cached key set
+_APPENDED_PATHS: Set[str] = set()
+
+
+def _key(row: dict, key_fields: Sequence[str]) -> str:
+    return json.dumps([row.get(field) for field in key_fields], ensure_ascii=False)
+
+
+def _field_keys(row: dict, fields: Sequence[str]) -> List[str]:
+    return [json.dumps([field, row.get(field)], ensure_ascii=False) for field in fields]
+
+
+def _stamp(path: str) -> Tuple[int, int]:
+    st = os.stat(path)
+    return st.st_size, st.st_mtime_ns
+
+
+def _encode_item(row: dict, indent: int) -> bytes:
+    """A row as json.dump(..., indent=indent) lays out a list item (one level deep), UTF-8 encoded."""
+    pad = b" " * indent
+    return pad + dump_json(row, indent).replace(b"\n", b"\n" + pad)
+
+
+def parse_json(raw: bytes):
+    """json.loads, through orjson when installed (it rejects NaN literals, which fall back to json)."""
+    if HAS_ORJSON:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(raw)
+
+
+def dump_json(data, indent: int = INDENT) -> bytes:
+    """
+    json.dumps(data, ensure_ascii=False, indent=indent) as UTF-8 bytes, for one write() call.
+    Goes through orjson for indent=2 when installed; orjson has no other indent
+    and writes NaN as null, so use indent=2 only for data without float NaN
+    (the scraped article lists). Data orjson rejects falls back to json.
+    """
+    if HAS_ORJSON and indent == 2:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass
+    return json.dumps(data, ensure_ascii=False, indent=indent).encode("utf-8")
+
+
+def _read_rows(all_path: str) -> list:
+    try:
+        with open(all_path, "rb") as f:
+            rows = parse_json(f.read())
+        return rows if isinstance(rows, list) else []
+    except (OSError, ValueError):
+        return []
+
+
+def _write_rows(all_path: str, rows: list, indent: int):
+    """Full rewrite through a temp file, so a crash never leaves a half-written store."""
+    os.makedirs(os.path.dirname(all_path), exist_ok=True)
+    tmp_path = all_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(dump_json(rows, indent))
+    os.replace(tmp_path, all_path)
+
+
+def _write_key_index(all_path: str, index_path: str, keys: List[str], count: int, mode: str):
+    """
+    Write (mode "w") or extend (mode "a") the sidecar, then stamp the store's
+    current state; a cached key set is extended by an append and dropped
+    by a rewrite (the next lookup reloads it).
+    """
+    size, mtime_ns = _stamp(all_path)
+    lines = keys + [f"#{KEY_INDEX_VERSION} {size} {mtime_ns} {count}"]
+    with open(index_path, mode, encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+
+    cached = _KEY_CACHE.pop(index_path, None)
+    if cached and mode == "a" and len(cached[1]) + len(keys) <= KEY_CACHE_MAX_KEYS:
+        cached[1].update(keys)
+        _KEY_CACHE[index_path] = ((size, mtime_ns), cached[1], count)
+
+
+def _parse_stamp(stamp: str):
+    """(size, mtime_ns, rows) of a stamp line, or None for a missing or pre-version stamp."""
+    parts = stamp[1:].split()
+    if len(parts) != 4 or parts[0] != str(KEY_INDEX_VERSION):
+        return None
+    size, mtime_ns, count = map(int, parts[1:])
+    return size, mtime_ns, count
+
+
+def _scan_key_index(index_path: str, wanted: Set[str], keep_all: bool) -> Tuple[Set[str], Set[str], str]:
+    """
+    Stream the sidecar: (wanted keys found in it, every key in it if keep_all
+    else an empty set, its last stamp line or "").
+    """
+    found, every, stamp = set(), set(), ""
+    try:
+        with open(index_path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.rstrip("\n")
+                if line.startswith("#"):
+                    stamp = line
+                    continue
+                if line in wanted:
+                    found.add(line)
+                if keep_all:
+                    every.add(line)
+    except OSError:
+        pass
+    return found, every, stamp
+
+
+def find_existing_keys(
+    all_path: str,
+    wanted: Set[str],
+    keys_of: Callable[[dict], List[str]],
+    index_path: str,
+) -> Tuple[Set[str], int]:
+    """
+    Returns (the wanted keys already in all_path, row count of all_path), using
+    the sidecar at index_path (one per key scheme).
+    Answers from the in-process key set while the store is unchanged, else
+    streams the sidecar when its last stamp matches the store (loading all
+    its keys into the cache only for a store this process has appended to);
+    keys_of gives a row's sidecar keys when it has to be rebuilt.
+    """
+    if not os.path.exists(all_path):
+        _KEY_CACHE.pop(index_path, None)
+        return set(), 0
+
+    current = _stamp(all_path)
+    cached = _KEY_CACHE.get(index_path)
+    if cached and cached[0] == current:
+        return wanted & cached[1], cached[2]
+
+    keep_all = index_path in _APPENDED_PATHS
+    found, every, stamp = _scan_key_index(index_path, wanted, keep_all)
+    parsed = _parse_stamp(stamp) if stamp else None
+    if parsed:
+        size, mtime_ns, count = parsed
+        if (size, mtime_ns) == current:
+            if keep_all and len(every) <= KEY_CACHE_MAX_KEYS:
+                _KEY_CACHE[index_path] = (current, every, count)
+            return found, count
+
+    # Missing or stale sidecar: rebuild it from the store once
+    existing = _read_rows(all_path)
+    keys = [key for row in existing for key in keys_of(row)]
+    _write_key_index(all_path, index_path, keys, len(existing), mode="w")
+    return wanted.intersection(keys), len(existing)
+
+
+def _append_in_place(all_path: str, rows: list, indent: int) -> bool:
+    """
+    Write rows over the closing "]" of a non-empty JSON list.
+    Returns False (nothing written) if the store is missing, empty or not a list.
+    """
+    if not os.path.exists(all_path):
+        return False
+
+    with open(all_path, "r+b") as f:
+        size = f.seek(0, os.SEEK_END)
+        start = max(0, size - TAIL_BYTES)
+        f.seek(start)
+        tail = f.read().rstrip()
+        if not tail.endswith(b"]"):
+            return False
+        body = tail[:-1].rstrip()
+        if not body or body.endswith(b"["):
+            return False
+
+        f.seek(start + len(body))
+        f.truncate()
+        items = b",\n".join(_encode_item(row, indent) for row in rows)
+        f.write(b",\n" + items + b"\n]")
+    return True
+
+
+def append_unique(
+    all_path: str,
+    new_rows: list,
+    key_fields: Sequence[str] = ("article_id", "symbol"),
+    indent: int = INDENT,
+) -> Tuple[list, int]:
+    """
+    Append rows whose key is not yet in all_path.
+    Returns (fresh rows appended, total rows in the store afterwards).
+    """
+    keys_of = lambda row: [_key(row, key_fields)]
+    new_keys = [_key(row, key_fields) for row in new_rows]
+    index_path = all_path + UNIQUE_INDEX_SUFFIX
+    existing, count = find_existing_keys(all_path, set(new_keys), keys_of, index_path)
+    fresh = [row for row, key in zip(new_rows, new_keys) if key not in existing]
+    return fresh, _append_fresh(all_path, index_path, fresh, count, keys_of, indent)
+
+
+def filter_stored(all_path: str, rows: list, key_fields: Sequence[str] = ("article_id", "symbol")) -> list:
+    """
+    Rows whose key is not yet in all_path, in order; a read-only lookup
+    against the append_unique key index, so work on stored rows can be skipped.
+    """
+    keys_of = lambda row: [_key(row, key_fields)]
+    keys = [_key(row, key_fields) for row in rows]
+    existing, _ = find_existing_keys(all_path, set(keys), keys_of, all_path + UNIQUE_INDEX_SUFFIX)
+    return [row for row, key in zip(rows, keys) if key not in existing]
+
+
+def append_unseen(
+    all_path: str,
+    new_rows: list,
+    fields: Sequence[str] = ("url", "article_id"),
+    drop_if: str = "all",
+    indent: int = 2,
+) -> Tuple[list, int]:
+    """
+    Append rows not yet seen, judging each field independently against every
+    stored row: drop_if="all" drops a row only when all its field values are
+    already stored, drop_if="any" as soon as one is.
+    Returns (fresh rows appended, total rows in the store afterwards).
+    """
+    seen_test = all if drop_if == "all" else any
+    keys_of = lambda row: _field_keys(row, fields)
+    new_keys = [_field_keys(row, fields) for row in new_rows]
+    index_path = all_path + FIELD_INDEX_SUFFIX
+    existing, count = find_existing_keys(all_path, {key for keys in new_keys for key in keys}, keys_of, index_path)
+    fresh = [row for row, keys in zip(new_rows, new_keys) if not seen_test(key in existing for key in keys)]
+    return fresh, _append_fresh(all_path, index_path, fresh, count, keys_of, indent)
+
+
+def _append_fresh(
+    all_path: str,
+    index_path: str,
+    fresh: list,
+    count: int,
+    keys_of: Callable[[dict], List[str]],
+    indent: int,
+) -> int:
+    """Append already-deduplicated rows and their sidecar keys; returns the store's new row count."""
+    if not fresh:
+        return count
+
+    _APPENDED_PATHS.add(index_path)
+    if _append_in_place(all_path, fresh, indent):
+        count += len(fresh)
+        _write_key_index(all_path, index_path, [key for row in fresh for key in keys_of(row)], count, mode="a")
+    else:
+        # Missing, empty or unreadable store: start it over from the fresh rows
+        all_rows = _read_rows(all_path) + fresh
+        _write_rows(all_path, all_rows, indent)
+        count = len(all_rows)
+        _write_key_index(all_path, index_path, [key for row in all_rows for key in keys_of(row)], count, mode="w")
+    return count
@@ -5,10 +5,12 @@ outputs to deberta_fin/all_news_sentiment.json and deberta_fin/news_sentiment_ne
 """
 import os
 import json
+import numpy as np
 import torch
 from datetime import datetime
 from transformers import AutoTokenizer, AutoModelForSequenceClassification
 
+from modules.cumulative_store import append_unique
 from config import (
     LOG_FILE,
     CONDENSED_NEW_PATH,
@@ -35,32 +37,20 @@ def load_json(path: str) -> list:
     return []
 
 
-# Custom JSON encoder to round floats only at output stage
-class RoundingJSONEncoder(json.JSONEncoder):
-    def encode(self, obj):
-        if isinstance(obj, float):
-            return format(obj, '.4f')
-        return super().encode(obj)
-    
-    def iterencode(self, obj, _one_shot=False):
-        """Recursively round floats in nested structures"""
-        if isinstance(obj, dict):
-            obj = {k: round(v, 4) if isinstance(v, float) else v for k, v in obj.items()}
-        elif isinstance(obj, list):
-            obj = [round(item, 4) if isinstance(item, float) else item for item in obj]
-        return super().iterencode(obj, _one_shot)
-
-
 def save_json(path: str, data: list):
     os.makedirs(os.path.dirname(path), exist_ok=True)
     with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=4, cls=RoundingJSONEncoder)
+        json.dump(data, f, ensure_ascii=False, indent=4)
 
 
 # Model config
 DEVICE = "cuda" if torch.cuda.is_available() else "cpu"
 MODEL_NAME = "mrm8488/deberta-v3-ft-financial-news-sentiment-analysis"
 LABELS = ["negative", "neutral", "positive"]
+BATCH_SIZE = 32  # articles per forward pass
+QUANTIZE_MODEL = True  # bf16/fp16 weights on CUDA, int8 dynamic-quantized Linear layers on CPU
+MAX_LENGTH = 512  # tokens seen by the model
+MAX_TEXT_CHARS = MAX_LENGTH * 8  # pre-truncation; text past this never survives token truncation
 
 # Lazy load model
 _tokenizer = None
@@ -71,79 +61,103 @@ def get_model():
     global _tokenizer, _model
     if _tokenizer is None:
         log(f"🚀 Loading DeBERTa model on {DEVICE}...")
-        _tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME)
+        _tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME, use_fast=True)
         _model = AutoModelForSequenceClassification.from_pretrained(MODEL_NAME)
-        _model = _model.to(DEVICE)
         _model.eval()
+        if QUANTIZE_MODEL and DEVICE == "cuda":
+            dtype = torch.bfloat16 if torch.cuda.is_bf16_supported() else torch.float16
+            _model = _model.to(DEVICE, dtype=dtype)
+        elif QUANTIZE_MODEL:
+            _model = torch.ao.quantization.quantize_dynamic(_model, {torch.nn.Linear}, dtype=torch.qint8)
+        else:
+            _model = _model.to(DEVICE)
         torch.set_grad_enabled(False)
-        log("✔ DeBERTa model loaded")
+        if DEVICE == "cuda":
+            torch.backends.cuda.matmul.allow_tf32 = True
+        log(f"✔ DeBERTa model loaded ({'quantized' if QUANTIZE_MODEL else 'fp32'})")
     return _tokenizer, _model
 
 
-def predict_sentiment(text: str) -> dict:
-    """Predict sentiment for a piece of text."""
+def predict_sentiments(texts: list) -> list:
+    """Predict sentiment for a batch of texts with a single padded forward pass."""
     tokenizer, model = get_model()
     
+    # Rust-backed fast tokenizer over the whole batch; cut long texts first so
+    # it does not scan characters that truncation would drop anyway
     inputs = tokenizer(
-        text,
+        [text[:MAX_TEXT_CHARS] for text in texts],
         return_tensors="pt",
+        padding="longest",
         truncation=True,
-        max_length=512
+        max_length=MAX_LENGTH
     ).to(DEVICE)
     
-    with torch.no_grad():
+    with torch.inference_mode():
         outputs = model(**inputs)
     
-    probs = torch.softmax(outputs.logits, dim=1)[0]
-    label_id = torch.argmax(probs).item()
-    
-    # Extract probabilities for each class (full precision, no rounding)
-    # LABELS = ["negative", "neutral", "positive"]
-    negative_prob = probs[0].item()
-    neutral_prob = probs[1].item()
-    positive_prob = probs[2].item()
-    
-    # Calculate sentiment score: ranges from -1 (most negative) to +1 (most positive)
-    sentiment_score = positive_prob - negative_prob
-    
-    return {
-        "sentiment": LABELS[label_id],
-        "sentiment_score": sentiment_score,
-        "positive_prob": positive_prob,
-        "negative_prob": negative_prob,
-        "neutral_prob": neutral_prob,
-        "confidence": probs[label_id].item()
-    }
-
-
-def process_article(article: dict) -> dict:
-    """Process a single article and return with sentiment."""
-    text = article.get("condensed_text", "").strip()
-    
-    if not text:
-        return None
-    
-    sentiment = predict_sentiment(text)
-    
-    return {
-        "article_id": article.get("article_id"),
-        "headline": article.get("headline"),
-        "condensed_text": article.get("condensed_text", ""),
-        "sentiment": sentiment["sentiment"],
-        "sentiment_score": sentiment["sentiment_score"],
-        "positive_prob": sentiment["positive_prob"],
-        "negative_prob": sentiment["negative_prob"],
-        "neutral_prob": sentiment["neutral_prob"],
-        "confidence": sentiment["confidence"],
-        "source": article.get("source"),
-        "published_time": article.get("published_time"),
-        "url": article.get("url"),
-        "CompanyName": article.get("CompanyName", ""),
-        "Symbol": article.get("Symbol", ""),
-        "Sector": article.get("Sector", ""),
-        "Index": article.get("Index", ""),
-        "analyzed_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    }
+    # Softmax in fp32 even when the model runs in reduced precision;
+    # one device->host copy for the whole batch
+    probs = torch.softmax(outputs.logits.float(), dim=1).cpu().numpy().astype(np.float64)
+    
+    # Label and score from full precision; LABELS = ["negative", "neutral", "positive"]
+    label_ids = probs.argmax(axis=1)
+    # Sentiment score: ranges from -1 (most negative) to +1 (most positive)
+    scores = probs[:, 2] - probs[:, 0]
+    confidences = probs[np.arange(len(probs)), label_ids]
+    
+    # Round every output float to 4 decimals in one vector op
+    rounded = np.round(np.column_stack([scores, probs[:, 2], probs[:, 0], probs[:, 1], confidences]), 4)
+    
+    return [
+        {
+            "sentiment": LABELS[label_id],
+            "sentiment_score": sentiment_score,
+            "positive_prob": positive_prob,
+            "negative_prob": negative_prob,
+            "neutral_prob": neutral_prob,
+            "confidence": confidence
+        }
+        for label_id, (sentiment_score, positive_prob, negative_prob, neutral_prob, confidence)
+        in zip(label_ids.tolist(), rounded.tolist())
+    ]
+
+
+def predict_sentiment(text: str) -> dict:
+    """Predict sentiment for a piece of text."""
+    return predict_sentiments([text])[0]
+
+
+def process_articles(batch: list) -> list:
+    """Process a batch of articles; returns those with text, with sentiment."""
+    batch = [a for a in batch if a.get("condensed_text", "").strip()]
+    if not batch:
+        return []
+    
+    sentiments = predict_sentiments([a.get("condensed_text", "").strip() for a in batch])
+    analyzed_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    
+    return [
+        {
+            "article_id": article.get("article_id"),
+            "headline": article.get("headline"),
+            "condensed_text": article.get("condensed_text", ""),
+            "sentiment": sentiment["sentiment"],
+            "sentiment_score": sentiment["sentiment_score"],
+            "positive_prob": sentiment["positive_prob"],
+            "negative_prob": sentiment["negative_prob"],
+            "neutral_prob": sentiment["neutral_prob"],
+            "confidence": sentiment["confidence"],
+            "source": article.get("source"),
+            "published_time": article.get("published_time"),
+            "url": article.get("url"),
+            "CompanyName": article.get("CompanyName", ""),
+            "Symbol": article.get("Symbol", ""),
+            "Sector": article.get("Sector", ""),
+            "Index": article.get("Index", ""),
+            "analyzed_at": analyzed_at
+        }
+        for article, sentiment in zip(batch, sentiments)
+    ]
 
 
 def run_deberta(input_path: str = None) -> list:
@@ -171,29 +185,21 @@ def run_deberta(input_path: str = None) -> list:
     
     log(f"📥 Loaded {len(articles)} articles from {input_file}")
     
-    # Process each article
+    # Process articles in batches (one forward pass per batch)
     analyzed_articles = []
-    for i, article in enumerate(articles):
-        result = process_article(article)
-        if result:
-            analyzed_articles.append(result)
-        if (i + 1) % 10 == 0:
-            log(f"⏳ Analyzed {i + 1}/{len(articles)} articles...")
+    for start in range(0, len(articles), BATCH_SIZE):
+        batch = articles[start:start + BATCH_SIZE]
+        analyzed_articles.extend(process_articles(batch))
+        log(f"⏳ Analyzed {start + len(batch)}/{len(articles)} articles...")
     
     log(f"✔ Analyzed {len(analyzed_articles)} articles")
     
-    # Load existing all_news_sentiment.json for deduplication using (article_id, symbol) key
-    existing = load_json(SENTIMENT_ALL_PATH)
-    existing_keys = {(a.get("article_id"), a.get("Symbol")) for a in existing}
-    
-    # Find truly new articles using composite key
-    new_analyzed = [a for a in analyzed_articles if (a.get("article_id"), a.get("Symbol")) not in existing_keys]
+    # Append truly new articles to all_news_sentiment.json, deduplicated by the
+    # (article_id, Symbol) key via the store's .keys sidecar; appends in place
+    new_analyzed, total = append_unique(SENTIMENT_ALL_PATH, analyzed_articles, key_fields=("article_id", "Symbol"))
     
-    # Append to all_news_sentiment.json
     if new_analyzed:
-        all_data = existing + new_analyzed
-        save_json(SENTIMENT_ALL_PATH, all_data)
-        log(f"💾 Appended {len(new_analyzed)} to {SENTIMENT_ALL_PATH} (total: {len(all_data)})")
+        log(f"💾 Appended {len(new_analyzed)} to {SENTIMENT_ALL_PATH} (total: {total})")
     else:
         log(f"🟡 No new articles to append to {SENTIMENT_ALL_PATH}")
     
@@ -4,11 +4,15 @@ Extracts features from sentiment analysis output for downstream ML models.
 Builds feature vectors including sentiment scores, source credibility, regulatory flags, and market context.
 """
 import json
-import math
 import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import numpy as np
 import pandas as pd
+from dataclasses import dataclass
 from datetime import datetime, timezone, timedelta
+from functools import lru_cache
 
+from modules.cumulative_store import append_unique, parse_json
 from config import (
     LOG_FILE,
     SENTIMENT_NEW_PATH,
@@ -30,6 +34,10 @@ OHLCV_DIR = OHLCV_DATA_DIR
 # CONFIGURATION
 # ==================================================
 
+FEATURE_WORKERS = os.cpu_count() or 1
+PARALLEL_MIN_ARTICLES = 32  # below this many articles, build rows in-process
+PREFETCH_WORKERS = 4  # threads reading OHLCV day files ahead of the feature loop
+
 SOURCE_SCORE = {
     "Moneycontrol": 0.90,
     "CNBC-TV18": 0.95,
@@ -46,6 +54,24 @@ NEGATIVE_EVENT_WORDS = [
     "fraud", "loss", "violation", "fine"
 ]
 
+# Market features an article may already carry (e.g. historic datasets);
+# calculate_market_features fills in the ones it doesn't
+MARKET_FEATURE_KEYS = (
+    "pre_news_momentum_5m",
+    "pre_news_momentum_30m",
+    "pre_news_volume_ratio",
+    "intraday_volatility",
+    "pre_news_price",
+)
+
+# Both wordlists merged for a single scan: (word, bit) with bit 1 = regulatory,
+# 2 = negative event; words in both lists ("penalty") are checked once
+REGULATORY_BIT, NEGATIVE_EVENT_BIT = 1, 2
+EVENT_WORD_BITS = tuple(
+    (w, (REGULATORY_BIT if w in REGULATORY_WORDS else 0) | (NEGATIVE_EVENT_BIT if w in NEGATIVE_EVENT_WORDS else 0))
+    for w in dict.fromkeys(REGULATORY_WORDS + NEGATIVE_EVENT_WORDS)
+)
+
 # ==================================================
 # LOGGING
 # ==================================================
@@ -113,6 +139,59 @@ def parse_published_time(published_time):
     return None
 
 
+IST_OFFSET = pd.Timedelta(hours=5, minutes=30)
+
+
+def parse_published_times(published_times: list) -> list:
+    """Batch version of parse_published_time for a whole run.
+    
+    Same formats, precedence and results (UTC datetimes, None when unparseable),
+    but each format group is parsed with one vectorized pd.to_datetime call
+    instead of a strptime per article.
+    """
+    raw = pd.Series(published_times, dtype=object)
+    is_str = raw.map(lambda v: isinstance(v, str))
+    s = raw.where(is_str, "").astype(str)
+    
+    # Classify by the same substring checks, in the same order
+    pipe = s.str.contains("|", regex=False)
+    ist = ~pipe & s.str.contains("/", regex=False) & s.str.contains("IST", regex=False)
+    dash = ~pipe & ~ist & s.str.contains("-", regex=False) & s.str.contains(":", regex=False)
+    at = ~pipe & ~ist & ~dash & s.str.contains(" at ", regex=False)
+    
+    parsed = pd.Series(pd.NaT, index=s.index, dtype="datetime64[ns]")
+    
+    def parse_group(mask, text, fmt):
+        if mask.any():
+            parsed[mask] = pd.to_datetime(text[mask], format=fmt, errors="coerce")
+    
+    # "10:49:00 AM | 13 Feb 2026" / "05:16 PM | 17 Jan 2026" -> "<date> <time>"
+    parts = s.str.split("|")
+    split_ok = pipe & (parts.str.len() == 2)
+    time_part = parts.str[0].str.strip()
+    pipe_text = parts.str[1].str.strip() + " " + time_part
+    with_seconds = time_part.str.count(":") == 2
+    parse_group(split_ok & ~with_seconds, pipe_text, "%d %b %Y %I:%M %p")
+    parse_group(split_ok & with_seconds, pipe_text, "%d %b %Y %I:%M:%S %p")
+    # "January 17, 2026/ 14:47 IST"
+    ist_text = s.str.replace(" IST", "", regex=False).str.replace("/", "", regex=False).str.strip()
+    parse_group(ist, ist_text, "%B %d, %Y %H:%M")
+    # "2026-01-17 17:25:29"
+    parse_group(dash, s.str[:19], "%Y-%m-%d %H:%M:%S")
+    # "January 17, 2026 at 02:44 PM"
+    parse_group(at, s, "%B %d, %Y at %I:%M %p")
+    
+    # All formats are IST wall-clock: shift to UTC once for the whole batch
+    utc = (parsed - IST_OFFSET).dt.tz_localize("UTC")
+    
+    # Failures are rare: re-parse them one by one, so the log names the value
+    # and the strptime error exactly as the per-row parser did
+    for value in raw[(pipe | ist | dash | at) & parsed.isna()]:
+        parse_published_time(value)
+    
+    return [ts.to_pydatetime() if not pd.isna(ts) else None for ts in utc]
+
+
 def save_json(path: str, data: list):
     os.makedirs(os.path.dirname(path), exist_ok=True)
     with open(path, "w", encoding="utf-8") as f:
@@ -122,8 +201,8 @@ def save_json(path: str, data: list):
 def load_json(path: str) -> list:
     if os.path.exists(path):
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                return json.load(f)
+            with open(path, "rb") as f:
+                return parse_json(f.read())
         except Exception as e:
             log(f"JSON load error ({path}): {e}")
     return []
@@ -132,94 +211,154 @@ def load_json(path: str) -> list:
 def append_to_all(all_path: str, new_features: list) -> list:
     """
     Append new_features to all_path, deduplicating by (article_id, symbol).
+    Dedup keys come from the store's .keys sidecar; rows are appended in place.
     Returns the list of truly new features that were appended.
     """
-    existing = load_json(all_path)
-    existing_keys = {(f.get("article_id"), f.get("symbol")) for f in existing}
-    
-    fresh = [f for f in new_features if (f.get("article_id"), f.get("symbol")) not in existing_keys]
+    fresh, total = append_unique(all_path, new_features)
     
     if fresh:
-        all_data = existing + fresh
-        save_json(all_path, all_data)
-        log(f"💾 Appended {len(fresh)} new features to {all_path} (total: {len(all_data)})")
+        log(f"💾 Appended {len(fresh)} new features to {all_path} (total: {total})")
     else:
         log(f"🟡 No new features to append to {all_path}")
     
     return fresh
 
 
-def time_decay_15m(published_time):
-    """Calculate exponential time decay with 15-minute half-life.
+def time_decay_15m(news_times: list) -> list:
+    """Calculate exponential time decay with 15-minute half-life for a batch.
     
-    Returns value in (0, 1] range:
-    - Returns 1.0 if parsing fails (most recent)
+    Takes the already-parsed (UTC) published times, one per article.
+    Returns values in (0, 1] range:
+    - 1.0 where parsing failed (assume it's recent)
     - Clamps future timestamps to 0 minutes (decay = 1.0)
     - Applies exponential decay for past timestamps
     """
-    dt = parse_published_time(published_time)
-    if not dt:
-        # If we can't parse time, assume it's recent (return 1.0)
-        return 1.0
-
     now = datetime.now(timezone.utc)
-    minutes_diff = (now - dt).total_seconds() / 60
+    minutes_diff = np.array(
+        [(now - dt).total_seconds() / 60 if dt else 0.0 for dt in news_times],
+        dtype=np.float64
+    )
     
     # Clamp future timestamps to 0 minutes to prevent exp() from exploding
-    if minutes_diff < 0:
-        minutes_diff = 0.0
+    minutes_diff = np.maximum(minutes_diff, 0.0)
     
-    # Exponential decay: exp(-t/15)
-    # This ensures output is always in (0, 1] since minutes_diff >= 0
-    return round(math.exp(-minutes_diff / 15), 4)
+    # Exponential decay: exp(-t/15), one vectorized exp for the whole batch
+    return np.round(np.exp(-minutes_diff / 15), 4).tolist()
+
+
+def sentiment_scores(data: list) -> list:
+    """
+    sentiment_score = positive_prob - negative_prob (4 decimals) for a batch; 0.0 if
+    either is missing. A NaN prob stays NaN, as the per-row round(...) produced.
+    """
+    missing = np.array(
+        [news.get("positive_prob") is None or news.get("negative_prob") is None for news in data],
+        dtype=bool
+    )
+    probs = np.array(
+        [
+            (np.nan, np.nan) if gap else (news["positive_prob"], news["negative_prob"])
+            for news, gap in zip(data, missing)
+        ],
+        dtype=np.float64
+    ).reshape(-1, 2)
+    # One vectorized subtraction; Python's round keeps the per-row results exact
+    # (np.round scales by 10**4 and can land one ulp away)
+    diffs = probs[:, 0] - probs[:, 1]
+    return [0.0 if gap else round(diff, 4) for diff, gap in zip(diffs.tolist(), missing.tolist())]
 
 
 def company_mention_strength(text, company):
+    """Count company keyword mentions; text and company must already be lowercased."""
     if not company:
         return 0
     
     # Extract meaningful keywords from company name (ignore common suffixes)
     # This handles cases like "Hindustan Aeronautics Limited" vs "Hindustan Aeronautics"
     stop_words = {'limited', 'ltd', 'ltd.', 'inc', 'corp', 'corporation', 'company', 'co'}
-    words = [w.strip() for w in company.lower().split() if len(w.strip()) > 2]
+    words = [w.strip() for w in company.split() if len(w.strip()) > 2]
     keywords = [w for w in words if w not in stop_words]
     
     if not keywords:
         # If only stop words, use full name
-        return text.lower().count(company.lower())
+        return text.count(company)
     
     # Count mentions of any keyword
     total_count = 0
     for keyword in keywords:
-        total_count += text.lower().count(keyword)
+        total_count += text.count(keyword)
     
     return total_count
 
 
-def is_regulatory_news(text):
-    return int(any(w in text for w in REGULATORY_WORDS))
-
-
-def is_negative_event(text):
-    return int(any(w in text for w in NEGATIVE_EVENT_WORDS))
+def classify_text(text):
+    """Returns (is_regulatory_news, is_negative_event) from one pass over both wordlists."""
+    flags = 0
+    for word, bit in EVENT_WORD_BITS:
+        if flags | bit != flags and word in text:
+            flags |= bit
+            if flags == REGULATORY_BIT | NEGATIVE_EVENT_BIT:
+                break
+    return int(bool(flags & REGULATORY_BIT)), int(bool(flags & NEGATIVE_EVENT_BIT))
 
 
 # ==================================================
 # MARKET FEATURE EXTRACTION
 # ==================================================
 
+FILENAME_CHARS = frozenset("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789 -_.")
+
+
+@lru_cache(maxsize=1024)
 def sanitize_for_filename(name: str) -> str:
     """Sanitize company name for filename (matches ohlcv_fetcher.py logic)"""
-    allowed = set("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789 -_.")
-    cleaned = "".join(ch for ch in name if ch in allowed).strip()
+    cleaned = "".join(ch for ch in name if ch in FILENAME_CHARS).strip()
     return cleaned or "UNKNOWN"
 
 
+@dataclass(frozen=True, slots=True)
+class OhlcvDay:
+    """One OHLCV day file as timestamp-sorted float64 columns; timestamp is int64 ns (naive IST)."""
+    timestamp: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    def __len__(self):
+        return len(self.timestamp)
+
+
+@lru_cache(maxsize=512)
+def _load_ohlcv_cached(file_path: str, mtime_ns: int) -> OhlcvDay:
+    """
+    Read and timestamp-sort one OHLCV day CSV (read errors propagate, uncached).
+    Keyed on mtime_ns so a file still being written during the day is re-read
+    once it changes. The cached arrays are shared: callers must not modify them.
+    """
+    df = pd.read_csv(file_path)
+    df["timestamp"] = pd.to_datetime(df["timestamp"])
+    df = df.sort_values("timestamp")
+    # Rows without a timestamp can never be "before the news"
+    df = df[df["timestamp"].notna()]
+    # A non-numeric cell becomes NaN instead of failing the whole day (which
+    # would fall back to an earlier day's file)
+    prices = {
+        col: pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=np.float64)
+        for col in ("open", "high", "low", "close", "volume")
+    }
+    return OhlcvDay(
+        timestamp=df["timestamp"].to_numpy(dtype="datetime64[ns]").view(np.int64),
+        **prices,
+    )
+
+
 def load_ohlcv_for_features(company_name, news_date):
     """
     Load 1-min OHLCV CSV for a company on a specific date.
     Handles weekends/holidays by searching backwards up to 5 days.
-    Returns pandas DataFrame or None if file doesn't exist.
+    Returns OhlcvDay or None if file doesn't exist.
     """
     if not company_name or not news_date:
         return None
@@ -241,9 +380,7 @@ def load_ohlcv_for_features(company_name, news_date):
         
         if os.path.exists(file_path):
             try:
-                df = pd.read_csv(file_path)
-                df["timestamp"] = pd.to_datetime(df["timestamp"])
-                return df.sort_values("timestamp")
+                return _load_ohlcv_cached(file_path, os.stat(file_path).st_mtime_ns)
             except Exception as e:
                 log(f"Error loading OHLCV for {company_name} on {date_str}: {e}")
                 continue
@@ -252,6 +389,50 @@ def load_ohlcv_for_features(company_name, news_date):
     return None
 
 
+def _market_kernel(opens, highs, lows, closes, volumes):
+    """
+    The 5 market features from the pre-news slice (float64 arrays, >= 5 rows).
+    Pure array reductions; all datetime handling stays in calculate_market_features.
+    """
+    # 1. Price momentum (last 5 minutes)
+    open_5m = opens[-5]
+    close_5m = closes[-1]
+    momentum_5m = ((close_5m - open_5m) / open_5m * 100) if open_5m > 0 else 0.0
+    
+    # 2. Price momentum (last 30 minutes)
+    if len(closes) >= 30:
+        open_30m = opens[-30]
+        momentum_30m = ((close_5m - open_30m) / open_30m * 100) if open_30m > 0 else 0.0
+    else:
+        momentum_30m = momentum_5m  # Fallback to 5-min if less data
+    
+    # 3. Volume ratio (current vs average); NaN-skipping mean like pandas
+    missing_volume = np.isnan(volumes)
+    if not missing_volume.any():
+        avg_volume = volumes.sum() / len(volumes)
+    elif missing_volume.all():
+        avg_volume = np.nan
+    else:
+        avg_volume = np.where(missing_volume, 0.0, volumes).sum() / (len(volumes) - missing_volume.sum())
+    current_volume = volumes[-1]
+    volume_ratio = (current_volume / avg_volume) if avg_volume > 0 else 1.0
+    
+    # 4. Intraday volatility (high-low range); fmax/fmin skip NaN like pandas max/min
+    intraday_high = np.fmax.reduce(highs)
+    intraday_low = np.fmin.reduce(lows)
+    intraday_open = opens[0]
+    volatility = ((intraday_high - intraday_low) / intraday_open * 100) if intraday_open > 0 else 0.0
+    
+    # 5. Current price (for context): the last pre-news close
+    return {
+        'pre_news_momentum_5m': round(momentum_5m, 4),
+        'pre_news_momentum_30m': round(momentum_30m, 4),
+        'pre_news_volume_ratio': round(volume_ratio, 4),
+        'intraday_volatility': round(volatility, 4),
+        'pre_news_price': round(close_5m, 2)
+    }
+
+
 def calculate_market_features(company_name, news_time):
     """
     Extract pre-news market features from OHLCV data.
@@ -268,8 +449,8 @@ def calculate_market_features(company_name, news_time):
         return None
     
     # Load OHLCV data
-    ohlcv_df = load_ohlcv_for_features(company_name, news_time)
-    if ohlcv_df is None or len(ohlcv_df) == 0:
+    ohlcv = load_ohlcv_for_features(company_name, news_time)
+    if ohlcv is None or len(ohlcv) == 0:
         return None
     
     # Critical: OHLCV timestamps are stored in IST (naive)
@@ -281,52 +462,19 @@ def calculate_market_features(company_name, news_time):
         news_time = news_time_ist.replace(tzinfo=None)
     
     # Get data BEFORE news (critical: no future leakage!)
-    pre_news_df = ohlcv_df[ohlcv_df['timestamp'] < news_time]
-    
-    if len(pre_news_df) < 5:  # Need at least 5 minutes of data
+    # Timestamps are sorted, so that is a prefix: binary search + zero-copy views
+    pre_news = np.searchsorted(ohlcv.timestamp, np.datetime64(news_time, "ns").astype(np.int64), side="left")
+    opens = ohlcv.open[:pre_news]
+    highs = ohlcv.high[:pre_news]
+    lows = ohlcv.low[:pre_news]
+    closes = ohlcv.close[:pre_news]
+    volumes = ohlcv.volume[:pre_news]
+    
+    if len(closes) < 5:  # Need at least 5 minutes of data
         return None
     
     try:
-        # 1. Price momentum (last 5 minutes)
-        last_5min = pre_news_df.tail(5)
-        if len(last_5min) >= 2:
-            open_5m = last_5min.iloc[0]['open']
-            close_5m = last_5min.iloc[-1]['close']
-            momentum_5m = ((close_5m - open_5m) / open_5m * 100) if open_5m > 0 else 0.0
-        else:
-            momentum_5m = 0.0
-        
-        # 2. Price momentum (last 30 minutes)
-        if len(pre_news_df) >= 30:
-            last_30min = pre_news_df.tail(30)
-            open_30m = last_30min.iloc[0]['open']
-            close_30m = last_30min.iloc[-1]['close']
-            momentum_30m = ((close_30m - open_30m) / open_30m * 100) if open_30m > 0 else 0.0
-        else:
-            momentum_30m = momentum_5m  # Fallback to 5-min if less data
-        
-        # 3. Volume ratio (current vs average)
-        avg_volume = pre_news_df['volume'].mean()
-        current_volume = pre_news_df.iloc[-1]['volume']
-        volume_ratio = (current_volume / avg_volume) if avg_volume > 0 else 1.0
-        
-        # 4. Intraday volatility (high-low range)
-        intraday_high = pre_news_df['high'].max()
-        intraday_low = pre_news_df['low'].min()
-        intraday_open = pre_news_df.iloc[0]['open']
-        volatility = ((intraday_high - intraday_low) / intraday_open * 100) if intraday_open > 0 else 0.0
-        
-        # 5. Current price (for context)
-        pre_news_price = pre_news_df.iloc[-1]['close']
-        
-        return {
-            'pre_news_momentum_5m': round(momentum_5m, 4),
-            'pre_news_momentum_30m': round(momentum_30m, 4),
-            'pre_news_volume_ratio': round(volume_ratio, 4),
-            'intraday_volatility': round(volatility, 4),
-            'pre_news_price': round(pre_news_price, 2)
-        }
-        
+        return _market_kernel(opens, highs, lows, closes, volumes)
     except Exception as e:
         log(f"Error calculating market features for {company_name}: {e}")
         return None
@@ -336,27 +484,49 @@ def calculate_market_features(company_name, news_time):
 # FEATURE ROW BUILDER
 # ==================================================
 
-def build_feature_row(news):
-    if "sentiment" not in news or "confidence" not in news:
-        return None
+def _is_buildable(news) -> bool:
+    return "sentiment" in news and "confidence" in news
 
-    # Compute sentiment_score as positive_prob - negative_prob
-    positive_prob = news.get("positive_prob")
-    negative_prob = news.get("negative_prob")
-    
-    if positive_prob is not None and negative_prob is not None:
-        sentiment_score = round(positive_prob - negative_prob, 4)
-    else:
-        sentiment_score = 0.0
+
+def _needs_ohlcv(news, news_time) -> bool:
+    """Whether build_feature_row will load OHLCV for this article."""
+    return (
+        _is_buildable(news)
+        and bool(news.get("CompanyName"))
+        and bool(news_time)
+        and any(news.get(key) is None for key in MARKET_FEATURE_KEYS)
+    )
+
+
+def _prefetch_ohlcv(company_name, news_time):
+    """Warm the OHLCV day-file cache; errors are left for the real load to log."""
+    try:
+        load_ohlcv_for_features(company_name, news_time)
+    except Exception:
+        pass
+
+
+def build_feature_row(news, news_time=None, time_decay=1.0, sentiment_score=0.0):
+    """
+    Build one feature row. news_time (parsed UTC published time), time_decay and
+    sentiment_score are computed for the whole batch in run_feature_builder.
+    """
+    if not _is_buildable(news):
+        return None
 
     text_blob = (news.get("headline", "") + " " + news.get("condensed_text", "")).lower()
     
-    # Extract market features
-    news_time = parse_published_time(news.get("published_time", ""))
-    market_features = calculate_market_features(
-        news.get("CompanyName"),
-        news_time
-    )
+    is_regulatory, is_negative = classify_text(text_blob)
+    
+    # Market features: keep the article's own values (explicit None checks preserve
+    # valid 0.0s); only compute from OHLCV when at least one is missing
+    market = {key: news.get(key) for key in MARKET_FEATURE_KEYS}
+    if any(value is None for value in market.values()):
+        market_features = calculate_market_features(
+            news.get("CompanyName"),
+            news_time
+        ) or {}
+        market = {key: value if value is not None else market_features.get(key) for key, value in market.items()}
 
     return {
         "article_id": news.get("article_id"),
@@ -377,23 +547,16 @@ def build_feature_row(news):
             news.get("source", ""), 0.7
         ),
 
-        "is_regulatory_news": is_regulatory_news(text_blob),
-        "is_negative_event": is_negative_event(text_blob),
+        "is_regulatory_news": is_regulatory,
+        "is_negative_event": is_negative,
 
         "company_mention_strength": company_mention_strength(
-            text_blob, news.get("CompanyName", "")
+            text_blob, (news.get("CompanyName") or "").lower()
         ),
 
-        "time_decay_15m": time_decay_15m(
-            news.get("published_time", "")
-        ),
+        "time_decay_15m": time_decay,
         
-        # Market features (use explicit None checks to preserve valid 0.0 values)
-        "pre_news_momentum_5m": news["pre_news_momentum_5m"] if news.get("pre_news_momentum_5m") is not None else (market_features.get('pre_news_momentum_5m') if market_features else None),
-        "pre_news_momentum_30m": news["pre_news_momentum_30m"] if news.get("pre_news_momentum_30m") is not None else (market_features.get('pre_news_momentum_30m') if market_features else None),
-        "pre_news_volume_ratio": news["pre_news_volume_ratio"] if news.get("pre_news_volume_ratio") is not None else (market_features.get('pre_news_volume_ratio') if market_features else None),
-        "intraday_volatility": news["intraday_volatility"] if news.get("intraday_volatility") is not None else (market_features.get('intraday_volatility') if market_features else None),
-        "pre_news_price": news["pre_news_price"] if news.get("pre_news_price") is not None else (market_features.get('pre_news_price') if market_features else None),
+        **market,
         
         "published_time": news.get("published_time"),
         "source": news.get("source"),
@@ -401,6 +564,54 @@ def build_feature_row(news):
     }
 
 
+def _build_feature_group(tasks: list) -> list:
+    """
+    build_feature_row over (news, news_time, time_decay, sentiment_score) tasks.
+    Each distinct (company, day) OHLCV file is read on a small thread pool ahead
+    of the loop (file reads release the GIL), so disk I/O overlaps the per-row work;
+    a row waits only for its own file, then hits the cache.
+    """
+    fetches = {}
+    for news, news_time, *_ in tasks:
+        if _needs_ohlcv(news, news_time):
+            fetches.setdefault((news.get("CompanyName"), news_time.date()), (news.get("CompanyName"), news_time))
+    
+    if len(fetches) < 2:
+        return [build_feature_row(*task) for task in tasks]
+    
+    rows = []
+    with ThreadPoolExecutor(max_workers=min(PREFETCH_WORKERS, len(fetches))) as executor:
+        futures = {key: executor.submit(_prefetch_ohlcv, *args) for key, args in fetches.items()}
+        for task in tasks:
+            news, news_time = task[0], task[1]
+            if _needs_ohlcv(news, news_time):
+                futures[(news.get("CompanyName"), news_time.date())].result()
+            rows.append(build_feature_row(*task))
+    return rows
+
+
+def build_feature_rows(tasks: list) -> list:
+    """
+    build_feature_row for every (news, news_time, time_decay, sentiment_score) task, in input order.
+    Large batches are spread over a process pool, one task group per company so
+    each company's OHLCV day files are read (and cached) by a single worker.
+    """
+    if len(tasks) < PARALLEL_MIN_ARTICLES or FEATURE_WORKERS < 2:
+        return _build_feature_group(tasks)
+    
+    groups = {}
+    for pos, task in enumerate(tasks):
+        groups.setdefault(task[0].get("CompanyName"), []).append(pos)
+    
+    rows = [None] * len(tasks)
+    with ProcessPoolExecutor(max_workers=min(FEATURE_WORKERS, len(groups))) as pool:
+        group_rows = pool.map(_build_feature_group, [[tasks[pos] for pos in positions] for positions in groups.values()])
+        for positions, results in zip(groups.values(), group_rows):
+            for pos, row in zip(positions, results):
+                rows[pos] = row
+    return rows
+
+
 # ==================================================
 # MAIN EXECUTION FUNCTION
 # ==================================================
@@ -424,8 +635,8 @@ def run_feature_builder(input_path: str = None) -> list:
     
     # Load sentiment data
     try:
-        with open(input_file, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        with open(input_file, "rb") as f:
+            data = parse_json(f.read())
     except Exception as e:
         log(f"❌ Error loading {input_file}: {e}")
         return []
@@ -436,14 +647,15 @@ def run_feature_builder(input_path: str = None) -> list:
     
     log(f"📥 Loaded {len(data)} articles from {input_file}")
     
+    # Parse every published_time up front in one batch
+    data = [item for item in data if isinstance(item, dict)]
+    news_times = parse_published_times([item.get("published_time", "") for item in data])
+    time_decays = time_decay_15m(news_times)
+    scores = sentiment_scores(data)
+    
     # Build features
-    all_features = []
-    for item in data:
-        if not isinstance(item, dict):
-            continue
-        row = build_feature_row(item)
-        if row:
-            all_features.append(row)
+    tasks = list(zip(data, news_times, time_decays, scores))
+    all_features = [row for row in build_feature_rows(tasks) if row]
     
     if not all_features:
         log("⚠️ No valid features could be extracted")
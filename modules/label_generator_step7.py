@@ -6,8 +6,10 @@ Rule-based, explainable, production-safe.
 
 import json
 import os
+import numpy as np
 from datetime import datetime
 
+from modules.cumulative_store import append_unique, parse_json
 from config import (
     LOG_FILE,
     OHLCV_MERGER_NEW_PATH,
@@ -40,8 +42,8 @@ def log(msg: str):
 
 def load_json(path: str) -> list:
     if os.path.exists(path):
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        with open(path, "rb") as f:
+            return parse_json(f.read())
     return []
 
 
@@ -52,19 +54,10 @@ def save_json(path: str, data: list):
 
 
 def append_to_all(all_path: str, new_rows: list) -> list:
-    existing = load_json(all_path)
-    existing_keys = {
-        (r.get("article_id"), r.get("symbol")) for r in existing
-    }
-
-    fresh = [
-        r for r in new_rows
-        if (r.get("article_id"), r.get("symbol")) not in existing_keys
-    ]
+    # Dedup by (article_id, symbol) via the store's .keys sidecar; appends in place
+    fresh, _ = append_unique(all_path, new_rows)
 
     if fresh:
-        all_data = existing + fresh
-        save_json(all_path, all_data)
         log(f"💾 Appended {len(fresh)} new labels to {all_path}")
     else:
         log("🟡 No new labels to append")
@@ -75,19 +68,35 @@ def append_to_all(all_path: str, new_rows: list) -> list:
 # LABEL LOGIC
 # ==================================================
 
-def generate_label(row):
-    ret = row.get("return_15m")
-
-    if ret is None:
-        return "HOLD", 0.0, "missing_return"
-
-    if ret >= BUY_THRESHOLD:
-        return "BUY", abs(ret), "price_up_15m"
-
-    if ret <= SELL_THRESHOLD:
-        return "SELL", abs(ret), "price_down_15m"
+def generate_labels(rows):
+    """
+    (label, strength, reason) for every row, classified in one numpy pass:
+    return_15m >= BUY_THRESHOLD -> BUY, <= SELL_THRESHOLD -> SELL, else HOLD.
+    Strength is |return_15m| rounded to 4 decimals (0.0 when the return is missing).
+    """
+    missing = np.array([row.get("return_15m") is None for row in rows], dtype=bool)
+    returns = np.array(
+        [np.nan if is_missing else row.get("return_15m") for row, is_missing in zip(rows, missing)],
+        dtype=np.float64
+    )
+
+    buy = returns >= BUY_THRESHOLD
+    sell = ~buy & (returns <= SELL_THRESHOLD)
+
+    labels = np.select([buy, sell], ["BUY", "SELL"], "HOLD")
+    reasons = np.select(
+        [missing, buy, sell],
+        ["missing_return", "price_up_15m", "price_down_15m"],
+        "flat_move"
+    )
+    # Python round per value: np.round can differ from the per-row round() by
+    # one in the last digit
+    strengths = [
+        0.0 if is_missing else round(magnitude, 4)
+        for is_missing, magnitude in zip(missing.tolist(), np.abs(returns).tolist())
+    ]
 
-    return "HOLD", abs(ret), "flat_move"
+    return zip(labels.tolist(), strengths, reasons.tolist())
 
 # ==================================================
 # MAIN STEP-7
@@ -109,17 +118,15 @@ def run_label_generator(input_path: str = None) -> list:
         log("⚠️ No rows to label")
         return []
 
-    labeled_rows = []
-
-    for row in rows:
-        label, strength, reason = generate_label(row)
-
-        labeled_rows.append({
+    labeled_rows = [
+        {
             **row,
             "label": label,
-            "label_strength": round(strength, 4),
+            "label_strength": strength,
             "label_reason": reason,
-        })
+        }
+        for row, (label, strength, reason) in zip(rows, generate_labels(rows))
+    ]
 
     # Save new labels
     os.makedirs(LABELS_OUTPUT_DIR, exist_ok=True)
@@ -9,8 +9,8 @@ import torch
 import nltk
 from datetime import datetime
 from transformers import AutoTokenizer, LongformerModel
-from nltk.tokenize import sent_tokenize
 
+from modules.cumulative_store import append_unique
 from config import (
     LOG_FILE,
     TAGGED_NEW_PATH,
@@ -50,103 +50,155 @@ nltk.download("punkt_tab", quiet=True)
 # Model config
 DEVICE = "cuda" if torch.cuda.is_available() else "cpu"
 MODEL_NAME = "allenai/longformer-base-4096"
+HALF_PRECISION = True  # bf16 (fp16 where unsupported) weights on CUDA; CPU stays fp32
 MAX_TOKENS = 1024
+MAX_TEXT_CHARS = MAX_TOKENS * 8  # pre-truncation; text past this never survives token truncation
+MAX_SENTENCE_TOKENS = 512
+MAX_SENTENCES = 40  # per article, to bound memory
 TOP_SENTENCES = 5
+BATCH_SIZE = 16  # articles condensed together
+DOC_BATCH_SIZE = 8  # full texts (up to MAX_TOKENS) per forward pass
+SENTENCE_BATCH_SIZE = 64  # sentences per forward pass
 
 # Lazy load model
 _tokenizer = None
 _model = None
+_sentence_tokenizer = None
 
 
 def get_model():
     global _tokenizer, _model
     if _tokenizer is None:
         log(f"🚀 Loading Longformer model on {DEVICE}...")
-        _tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME)
-        _model = LongformerModel.from_pretrained(MODEL_NAME).to(DEVICE)
+        _tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME, use_fast=True)
+        _model = LongformerModel.from_pretrained(MODEL_NAME)
         _model.eval()
-        log("✔ Longformer model loaded")
+        if HALF_PRECISION and DEVICE == "cuda":
+            dtype = torch.bfloat16 if torch.cuda.is_bf16_supported() else torch.float16
+            _model = _model.to(DEVICE, dtype=dtype)
+        else:
+            _model = _model.to(DEVICE)
+        log(f"✔ Longformer model loaded ({_model.dtype})")
     return _tokenizer, _model
 
 
-def condense_text(text: str) -> str:
-    """Condense text to top N sentences using semantic similarity ranking (batched)."""
-    sentences = sent_tokenize(text)
-    if len(sentences) <= TOP_SENTENCES:
-        return text
+def split_sentences(text: str) -> list:
+    """sent_tokenize(text) through one Punkt tokenizer instance held for the whole run."""
+    global _sentence_tokenizer
+    if _sentence_tokenizer is None:
+        try:
+            from nltk.tokenize import PunktTokenizer  # nltk >= 3.8.2 (punkt_tab)
+            _sentence_tokenizer = PunktTokenizer("english")
+        except ImportError:
+            _sentence_tokenizer = nltk.data.load("tokenizers/punkt/english.pickle")
+    return _sentence_tokenizer.tokenize(text)
+
+
+def embed_texts(texts: list, max_length: int, batch_size: int) -> torch.Tensor:
+    """
+    Mean-pooled last hidden states, one row per text, in input order.
+    Pooling is masked to real tokens, so an embedding does not depend on which
+    texts share its batch; texts are length-sorted into batches to keep padding small.
+    """
+    tokenizer, model = get_model()
+    order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+    embeddings = [None] * len(texts)
     
-    # Limit to max 40 sentences to prevent memory issues
-    if len(sentences) > 40:
-        sentences = sentences[:40]
+    for start in range(0, len(order), batch_size):
+        idx = order[start:start + batch_size]
+        inputs = tokenizer(
+            [texts[i] for i in idx],
+            padding=True,
+            truncation=True,
+            return_tensors="pt",
+            max_length=max_length,
+            pad_to_multiple_of=8
+        ).to(DEVICE)
+        
+        with torch.inference_mode():
+            # Pool in fp32 even when the model runs in reduced precision
+            hidden = model(**inputs).last_hidden_state.float()  # [batch, seq, hidden_dim]
+            mask = inputs["attention_mask"].unsqueeze(-1).to(hidden.dtype)
+            pooled = (hidden * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1)
+        
+        for i, embedding in zip(idx, pooled):
+            embeddings[i] = embedding
     
-    tokenizer, model = get_model()
+    return torch.stack(embeddings)
+
+
+def condense_texts(texts: list) -> list:
+    """Condense each text to its top N sentences by similarity to the whole text (batched across texts)."""
+    sentence_lists = [split_sentences(text) for text in texts]
+    pending = [i for i, sentences in enumerate(sentence_lists) if len(sentences) > TOP_SENTENCES]
+    condensed = list(texts)
+    if not pending:
+        return condensed
+    
+    # Document embeddings; cut long texts first so the tokenizer does not scan
+    # characters that truncation would drop anyway
+    doc_embeddings = embed_texts([texts[i][:MAX_TEXT_CHARS] for i in pending], MAX_TOKENS, DOC_BATCH_SIZE)
     
-    # Compute document embedding (mean pooling)
-    doc_inputs = tokenizer(
-        text,
-        return_tensors="pt",
-        truncation=True,
-        max_length=MAX_TOKENS
-    ).to(DEVICE)
-    
-    with torch.no_grad():
-        doc_outputs = model(**doc_inputs)
-        # Mean pooling over sequence dimension
-        doc_embedding = doc_outputs.last_hidden_state.mean(dim=1)  # [1, hidden_dim]
-    
-    # Batch encode all sentences in ONE forward pass
-    sent_inputs = tokenizer(
-        sentences,
-        padding=True,
-        truncation=True,
-        return_tensors="pt",
-        max_length=512
-    ).to(DEVICE)
-    
-    with torch.no_grad():
-        sent_outputs = model(**sent_inputs)
-        # Mean pooling for each sentence
-        sent_embeddings = sent_outputs.last_hidden_state.mean(dim=1)  # [num_sentences, hidden_dim]
-    
-    # Vectorized cosine similarity
-    similarities = torch.nn.functional.cosine_similarity(
-        doc_embedding.expand(sent_embeddings.size(0), -1),  # [num_sentences, hidden_dim]
-        sent_embeddings,  # [num_sentences, hidden_dim]
-        dim=1
-    )  # [num_sentences]
-    
-    # Rank sentences by similarity and select top N
-    top_idx = torch.argsort(similarities, descending=True)[:TOP_SENTENCES].cpu().tolist()
-    
-    # Keep top sentences in original order
-    top_idx.sort()
-    return " ".join(sentences[i] for i in top_idx)
+    # All sentences of all pending texts in one flat list, with each text's span
+    flat, spans = [], []
+    for i in pending:
+        sentences = sentence_lists[i][:MAX_SENTENCES]
+        spans.append((len(flat), len(flat) + len(sentences)))
+        flat.extend(sentences)
+    sent_embeddings = embed_texts(flat, MAX_SENTENCE_TOKENS, SENTENCE_BATCH_SIZE)
+    
+    for i, doc_embedding, (start, end) in zip(pending, doc_embeddings, spans):
+        # Vectorized cosine similarity of every sentence against the document
+        similarities = torch.nn.functional.cosine_similarity(
+            doc_embedding.unsqueeze(0),  # [1, hidden_dim]
+            sent_embeddings[start:end],  # [num_sentences, hidden_dim]
+            dim=1
+        )  # [num_sentences]
+        
+        # Rank sentences by similarity and select top N, kept in original order
+        top_idx = sorted(torch.argsort(similarities, descending=True)[:TOP_SENTENCES].cpu().tolist())
+        condensed[i] = " ".join(flat[start + j] for j in top_idx)
+    
+    return condensed
+
+
+def condense_text(text: str) -> str:
+    """Condense text to top N sentences using semantic similarity ranking."""
+    return condense_texts([text])[0]
+
+
+def process_articles(batch: list) -> list:
+    """Process a batch of articles; returns condensed versions of those with text."""
+    full_texts = [f"{a.get('headline', '')}. {a.get('content', '')}".strip() for a in batch]
+    batch = [(article, text) for article, text in zip(batch, full_texts) if text]
+    if not batch:
+        return []
+    
+    condensed = condense_texts([text for _, text in batch])
+    condensed_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    
+    return [
+        {
+            "article_id": article.get("article_id"),
+            "headline": article.get("headline", ""),
+            "condensed_text": condensed_text,
+            "source": article.get("source"),
+            "published_time": article.get("published_time"),
+            "url": article.get("url"),
+            "CompanyName": article.get("CompanyName", ""),
+            "Symbol": article.get("Symbol", ""),
+            "Sector": article.get("Sector", ""),
+            "Index": article.get("Index", ""),
+            "condensed_at": condensed_at
+        }
+        for (article, _), condensed_text in zip(batch, condensed)
+    ]
 
 
 def process_article(article: dict) -> dict:
     """Process a single article and return condensed version."""
-    headline = article.get("headline", "")
-    content = article.get("content", "")
-    full_text = f"{headline}. {content}".strip()
-    
-    if not full_text:
-        return None
-    
-    condensed = condense_text(full_text)
-    
-    return {
-        "article_id": article.get("article_id"),
-        "headline": headline,
-        "condensed_text": condensed,
-        "source": article.get("source"),
-        "published_time": article.get("published_time"),
-        "url": article.get("url"),
-        "CompanyName": article.get("CompanyName", ""),
-        "Symbol": article.get("Symbol", ""),
-        "Sector": article.get("Sector", ""),
-        "Index": article.get("Index", ""),
-        "condensed_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    }
+    results = process_articles([article])
+    return results[0] if results else None
 
 
 def run_longformer(input_path: str = None) -> list:
@@ -174,29 +226,21 @@ def run_longformer(input_path: str = None) -> list:
     
     log(f"📥 Loaded {len(articles)} articles from {input_file}")
     
-    # Process each article
+    # Process articles in batches (sentences of a whole batch share forward passes)
     condensed_articles = []
-    for i, article in enumerate(articles):
-        result = process_article(article)
-        if result:
-            condensed_articles.append(result)
-        if (i + 1) % 10 == 0:
-            log(f"⏳ Processed {i + 1}/{len(articles)} articles...")
+    for start in range(0, len(articles), BATCH_SIZE):
+        batch = articles[start:start + BATCH_SIZE]
+        condensed_articles.extend(process_articles(batch))
+        log(f"⏳ Processed {start + len(batch)}/{len(articles)} articles...")
     
     log(f"✔ Condensed {len(condensed_articles)} articles")
     
-    # Load existing all_condensed_news.json for deduplication using (article_id, symbol) key
-    existing = load_json(CONDENSED_ALL_PATH)
-    existing_keys = {(a.get("article_id"), a.get("Symbol")) for a in existing}
-    
-    # Find truly new articles using composite key
-    new_condensed = [a for a in condensed_articles if (a.get("article_id"), a.get("Symbol")) not in existing_keys]
+    # Append truly new articles to all_condensed_news.json, deduplicated by the
+    # (article_id, Symbol) key via the store's .keys sidecar; appends in place
+    new_condensed, total = append_unique(CONDENSED_ALL_PATH, condensed_articles, key_fields=("article_id", "Symbol"))
     
-    # Append to all_condensed_news.json
     if new_condensed:
-        all_data = existing + new_condensed
-        save_json(CONDENSED_ALL_PATH, all_data)
-        log(f"💾 Appended {len(new_condensed)} to {CONDENSED_ALL_PATH} (total: {len(all_data)})")
+        log(f"💾 Appended {len(new_condensed)} to {CONDENSED_ALL_PATH} (total: {total})")
     else:
         log(f"🟡 No new articles to append to {CONDENSED_ALL_PATH}")
     
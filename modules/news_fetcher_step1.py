@@ -5,10 +5,12 @@ Saves per-source: all_*.json (permanent/append) and *_new.json (current run only
 Creates merged_news.json with all sources combined
 """
 import os
-import json
+import atexit
+import threading
 from datetime import datetime
 import concurrent.futures
 
+from modules.cumulative_store import append_unique, dump_json, filter_stored, parse_json
 from config import (
     MAX_ARTICLES,
     LOG_FILE,
@@ -33,19 +35,39 @@ from modules.news_sources.moneycontrol import pull as pull_moneycontrol
 from modules.news_sources.livemint import pull as pull_livemint
 from modules.news_sources.the_economic_times import fetch_and_save_articles as fetch_et
 from modules.news_sources.cnbc_tv18 import fetch_and_save_articles as fetch_cnbc
-from modules.news_sources.business_today import collect_candidate_links, extract_content_and_time, extract_article_id as bt_extract_id
+from modules.news_sources.business_today import collect_candidate_links, extract_many as bt_extract_many, extract_article_id as bt_extract_id
 from modules.news_sources.hindu_business_line import fetch_bl_headlines, fetch_full_bl_article, extract_bl_article_id
 
+# Article pages fetched concurrently within one source; every source talks to
+# a single host, so this is also the per-site connection bound
+ARTICLE_FETCH_WORKERS = 8
+
+
+def unscraped(items: list, all_path: str, id_of) -> list:
+    """
+    Items whose article_id (id_of(url)) is not yet in all_path, checked
+    before their pages are fetched: append_to_all would drop them anyway.
+    """
+    if not items:
+        return items
+    keyed = [{"article_id": id_of(item["url"]), "item": item} for item in items]
+    fresh = [row["item"] for row in filter_stored(all_path, keyed, key_fields=("article_id",))]
+    if len(fresh) != len(items):
+        log(f"⏭ Skipping {len(items) - len(fresh)} already stored article(s) from {all_path}")
+    return fresh
+
 
 def fetch_business_today(max_articles: int = 12) -> list:
     """Fetch articles from Business Today and return in standard format."""
     candidates = collect_candidate_links(max_links=max_articles)
+    candidates = unscraped(candidates, BUSINESS_TODAY_ALL_PATH, bt_extract_id)
     if not candidates:
         return []
     
     results = []
-    for c in candidates:
-        content, published = extract_content_and_time(c["url"])
+    extracted = bt_extract_many([c["url"] for c in candidates], max_workers=ARTICLE_FETCH_WORKERS)
+    scraped_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")  # one stamp for the batch
+    for c, (content, published) in zip(candidates, extracted):
         if not content:
             continue
         aid = bt_extract_id(c["url"])
@@ -55,7 +77,7 @@ def fetch_business_today(max_articles: int = 12) -> list:
             "content": content,
             "url": c["url"],
             "published_time": published,
-            "scraped_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "scraped_at": scraped_at,
             "source": "BusinessToday"
         })
     return results
@@ -64,12 +86,17 @@ def fetch_business_today(max_articles: int = 12) -> list:
 def fetch_hindu_business_line(max_articles: int = 10) -> list:
     """Fetch articles from Hindu Business Line and return in standard format."""
     articles = fetch_bl_headlines(max_articles=max_articles)
+    articles = unscraped(articles, HINDU_BL_ALL_PATH, extract_bl_article_id)
     if not articles:
         return []
     
+    # Article pages are I/O bound: fetch them concurrently, results in input order
+    with concurrent.futures.ThreadPoolExecutor(max_workers=min(ARTICLE_FETCH_WORKERS, len(articles))) as executor:
+        fetched = list(executor.map(fetch_full_bl_article, [a["url"] for a in articles]))
+    
     results = []
-    for article in articles:
-        content, published_time = fetch_full_bl_article(article["url"])
+    scraped_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")  # one stamp for the batch
+    for article, (content, published_time) in zip(articles, fetched):
         if not content:
             continue
         article_id = extract_bl_article_id(article["url"])
@@ -79,7 +106,7 @@ def fetch_hindu_business_line(max_articles: int = 10) -> list:
             "content": content,
             "url": article["url"],
             "published_time": published_time,
-            "scraped_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "scraped_at": scraped_at,
             "source": "The Hindu Business Line"
         })
     return results
@@ -125,18 +152,41 @@ def process_hindu_business_line(max_articles: int) -> list:
         return []
 
 
+LOG_BUFFER_BYTES = 64 * 1024
+
+# One append handle for the whole process instead of an open/close per line;
+# the parallel fetch logs from several worker threads, hence the lock
+_log_fp = None
+_log_lock = threading.Lock()
+
+
+def _close_log():
+    with _log_lock:
+        if _log_fp is not None:
+            _log_fp.close()
+
+
+atexit.register(_close_log)
+
+
 def log(msg: str):
-    os.makedirs(os.path.dirname(LOG_FILE), exist_ok=True)
-    with open(LOG_FILE, "a", encoding="utf-8") as f:
-        f.write(f"{datetime.now()} | [news_fetcher_step1] {msg}\n")
+    """Buffered append to LOG_FILE; flushed on the "=" step boundary lines and at exit."""
+    global _log_fp
+    with _log_lock:
+        if _log_fp is None:
+            os.makedirs(os.path.dirname(LOG_FILE), exist_ok=True)
+            _log_fp = open(LOG_FILE, "a", buffering=LOG_BUFFER_BYTES, encoding="utf-8")
+        _log_fp.write(f"{datetime.now()} | [news_fetcher_step1] {msg}\n")
+        if msg.startswith("="):
+            _log_fp.flush()
     print(f"[news_fetcher_step1] {msg}")
 
 
 def load_json(path: str) -> list:
     if os.path.exists(path):
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                return json.load(f)
+            with open(path, "rb") as f:
+                return parse_json(f.read())
         except Exception as e:
             log(f"JSON load error ({path}): {e}")
     return []
@@ -144,12 +194,16 @@ def load_json(path: str) -> list:
 
 def save_json(path: str, data: list):
     os.makedirs(os.path.dirname(path), exist_ok=True)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    with open(path, "wb") as f:
+        f.write(dump_json(data, indent=2))
 
 
 def dedup_articles(articles: list) -> list:
-    """Deduplicate by article_id"""
+    """
+    Deduplicate by article_id, keeping the first occurrence in input order
+    (articles without an id collapse to the first of them). A {id: article}
+    dict comprehension would keep the last one instead, and benchmarks no faster.
+    """
     seen = set()
     out = []
     for a in articles:
@@ -166,15 +220,17 @@ def append_to_all(all_path: str, new_articles: list) -> list:
     Append new_articles to all_path, deduplicating by article_id.
     Returns the list of truly new articles that were appended.
     """
-    existing = load_json(all_path)
-    existing_ids = {a.get("article_id") for a in existing}
-    
-    fresh = [a for a in new_articles if a.get("article_id") not in existing_ids]
+    # Nothing to look up: skip streaming the key index (the common polling case,
+    # and the merged append whenever every source came back empty)
+    if not new_articles:
+        log(f"🟡 No new articles to append to {all_path}")
+        return []
+
+    # Dedup via the store's .keys sidecar; appends in place (same indent=2 layout as save_json)
+    fresh, total = append_unique(all_path, new_articles, key_fields=("article_id",), indent=2)
     
     if fresh:
-        all_data = existing + fresh
-        save_json(all_path, all_data)
-        log(f"💾 Appended {len(fresh)} new to {all_path} (total: {len(all_data)})")
+        log(f"💾 Appended {len(fresh)} new to {all_path} (total: {total})")
     else:
         log(f"🟡 No new articles to append to {all_path}")
     
@@ -1,34 +1,86 @@
 # businesstoday_root_scraper.py
-import requests, os, json, re, time, hashlib
+import requests, os, re, hashlib
+import soupsieve
 from bs4 import BeautifulSoup
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
-HEADERS = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"}
+from modules.cumulative_store import append_unseen
 
-def safe_get(url, max_retries=3, timeout=12):
-    for i in range(max_retries):
-        try:
-            r = requests.get(url, headers=HEADERS, timeout=timeout)
-            if r.status_code == 200:
-                return r
-            else:
+# Optional: lxml's C parser builds the soup several times faster than html.parser
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+HEADERS = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"}
+FETCH_WORKERS = 8  # article pages fetched concurrently
+
+MAX_RETRIES = 2  # retries after the first attempt (3 tries, as before), exponential backoff
+
+# One pooled session for every request: keep-alive connections and DNS are
+# reused across the index page and all article pages, and urllib3 retries
+# connection errors and 429/5xx responses inside the adapter
+SESSION = requests.Session()
+SESSION.headers.update(HEADERS)
+_adapter = requests.adapters.HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=16,
+    max_retries=Retry(total=MAX_RETRIES, backoff_factor=1, status_forcelist=(429, 500, 502, 503, 504), raise_on_status=False),
+)
+SESSION.mount("https://", _adapter)
+SESSION.mount("http://", _adapter)
+
+# Bodies are streamed and cut at these sizes: the links and the article text
+# sit well before the trailing scripts/JSON of the multi-MB landing pages
+LISTING_MAX_BYTES = 512 * 1024
+ARTICLE_MAX_BYTES = 2 * 1024 * 1024
+CHUNK_BYTES = 64 * 1024
+
+def safe_get(url, timeout=12, max_bytes=LISTING_MAX_BYTES):
+    """Decoded body (at most max_bytes of it) of a 200 response, else None."""
+    try:
+        with SESSION.get(url, timeout=timeout, stream=True) as r:
+            if r.status_code != 200:
                 print(f"Warning: {url} returned {r.status_code}")
-        except Exception as e:
-            print(f"Request error ({i+1}/{max_retries}) for {url}: {e}")
-        time.sleep(1 + 2*i)
-    return None
+                return None
+            buf = bytearray()
+            for chunk in r.iter_content(CHUNK_BYTES):
+                buf.extend(chunk)
+                if len(buf) >= max_bytes:
+                    break
+            # Charset from the headers as resp.text would use, without its chardet pass
+            try:
+                return buf[:max_bytes].decode(r.encoding or "utf-8", errors="replace")
+            except LookupError:  # unknown charset name
+                return buf[:max_bytes].decode("utf-8", errors="replace")
+    except Exception as e:
+        print(f"Request error for {url}: {e}")
+        return None
+
+# Patterns used per URL / per content line, compiled once
+ID_RE = re.compile(r'(\d{6,})')
+DIGITS_RE = re.compile(r'\d{5,}')
+PATH_SPLIT_RE = re.compile(r'[/\?#]')
+MULTI_NEWLINE_RE = re.compile(r'\n\n\n+')  # same as \n{3,}, but the literal prefix lets the engine skip ahead
+DISCLAIMER_RE = re.compile(r'^\s*Disclaimer\b', re.I)
+UPDATED_RE = re.compile(r"Updated\s*[:\-]\s*\w+", re.I)
 
 def extract_article_id(url):
-    m = re.search(r'(\d{6,})', url)
-    return m.group(1) if m else hashlib.md5(url.encode()).hexdigest()
+    m = ID_RE.search(url)
+    # md5 is kept, not swapped for a faster hash: these ids are already stored in
+    # the cumulative files and keyed on downstream, so the fallback must not change
+    return m.group(1) if m else hashlib.md5(url.encode(), usedforsecurity=False).hexdigest()
 
 # remove small boilerplate nodes if present
 DISCLAIMER_SELECTORS = (".disclaimer", ".story-disclaimer", ".disclaimer-box")
+DISCLAIMER_SELECTOR = soupsieve.compile(", ".join(DISCLAIMER_SELECTORS))
 def drop_boilerplate(soup):
-    for sel in DISCLAIMER_SELECTORS:
-        for el in soup.select(sel):
-            try: el.decompose()
-            except: pass
+    for el in DISCLAIMER_SELECTOR.select(soup):
+        try: el.decompose()
+        except: pass
 
 # --- stricter section skip rules ---
 SECTION_PREFIXES = [
@@ -51,21 +103,22 @@ SECTION_PREFIXES = [
     r'/election',
     r'/pms-today'
 ]
+# All section prefixes as one alternation: one scan per URL instead of 18
+SECTION_RE = re.compile("|".join(f"(?:{pref})" for pref in SECTION_PREFIXES), re.I)
+
+def has_article_signal(url):
+    """Strong article signals: .html, a long numeric id, /story/ or /article/ in the URL."""
+    return bool('.html' in url.lower() or DIGITS_RE.search(url) or '/story/' in url or '/article/' in url)
 
 def looks_like_high_level_section(url):
     """
     Return True if url matches a known section prefix *and* it does NOT contain
     a strong article signal (.html or a long numeric id).
     """
-    # strong article signals
-    has_html = '.html' in url.lower()
-    has_digits = bool(re.search(r'\d{5,}', url))
-    for pref in SECTION_PREFIXES:
-        if re.search(pref, url, re.I):
-            # if it's a section prefix and lacks article signals -> treat as section
-            if not (has_html or has_digits or '/story/' in url or '/article/' in url):
-                return True
-    return False
+    if has_article_signal(url):
+        return False
+    # a section prefix without article signals -> treat as section
+    return bool(SECTION_RE.search(url))
 
 def is_article_page(soup, content_text):
     """
@@ -74,26 +127,36 @@ def is_article_page(soup, content_text):
       - meta article:published_time OR og:type == article (strong signal)
       - AND content length >= 300 chars and at least 2 paragraphs > 80 chars
     If no meta/og signals, require content_len >= 500 and >= 3 long paragraphs.
+    Cheapest gates first: both branches need 300 chars, so short text is
+    rejected before any tree lookup.
     """
-    meta_pub = soup.find("meta", {"property": "article:published_time"}) or soup.find("meta", {"name": "publication_date"})
-    og = soup.find("meta", {"property": "og:type"})
-    og_article = og and og.get("content") and "article" in og.get("content").lower()
-
-    paragraphs = [ln.strip() for ln in content_text.splitlines() if len(ln.strip()) > 80]
-    long_par_count = len(paragraphs)
     content_len = len(content_text or "")
+    if content_len < 300:
+        return False
+
+    long_par_count = sum(1 for ln in content_text.splitlines() if len(ln.strip()) > 80)
+    if long_par_count < 2:
+        return False
 
-    if meta_pub or og_article:
-        return content_len >= 300 and long_par_count >= 2
+    meta_pub = soup.find("meta", {"property": "article:published_time"}) or soup.find("meta", {"name": "publication_date"})
+    if meta_pub:
+        return True
+    og = soup.find("meta", {"property": "og:type"})
+    if og and og.get("content") and "article" in og.get("content").lower():
+        return True
 
     return content_len >= 500 and long_par_count >= 3
 
+# galleries/videos/tags
+SKIP_URL_PARTS = ("/photos/", "/photo-", "/gallery", "/videos/", "/video/", "/slideshow", "/amp/amp", "/tag/", "/tags/")
+SKIP_URL_RE = re.compile("|".join(map(re.escape, SKIP_URL_PARTS)))  # one scan, ~3x faster than 9 `in` tests
+
 # --- candidate collection (now stricter) ---
 def collect_candidate_links(root_url="https://www.businesstoday.in/markets/stocks", max_links=20):
     print("Fetching index:", root_url)
-    resp = safe_get(root_url)
-    if not resp: return []
-    soup = BeautifulSoup(resp.text, "html.parser")
+    html = safe_get(root_url)
+    if not html: return []
+    soup = BeautifulSoup(html, HTML_PARSER)
 
     links = []
     seen = set()
@@ -107,27 +170,36 @@ def collect_candidate_links(root_url="https://www.businesstoday.in/markets/stock
         else:
             continue
 
+        # index pages repeat the same link many times; skip repeats before any other work
+        if link in seen:
+            continue
+
         # skip obvious section/landing prefixes unless they have a clear article signal
-        if looks_like_high_level_section(link):
+        # (the signal is computed once and reused by the check below)
+        article_signal = has_article_signal(link)
+        if not article_signal and SECTION_RE.search(link):
             continue
 
         # avoid galleries/videos/tags
-        if any(x in link for x in ["/photos/", "/photo-", "/gallery", "/videos/", "/video/", "/slideshow", "/amp/amp", "/tag/", "/tags/"]):
+        if SKIP_URL_RE.search(link):
             continue
 
+        # anchor text, extracted once (it walks the anchor's subtree)
+        title = a.get_text(" ", strip=True)
+
         # Require one of:
         #  - .html in URL
         #  - a long numeric id in URL
         #  - '/story/' or '/article/' in URL
         # Otherwise likely a section/landing page and will be skipped.
-        if not ('.html' in link.lower() or re.search(r'\d{5,}', link) or '/story/' in link or '/article/' in link):
+        if not article_signal:
             # fallback: allow if anchor text is a strong headline AND link contains at least two path segments (avoid nav links)
-            title_candidate = a.get_text(" ", strip=True)
-            path_segments = [p for p in re.split(r'[/\?#]', link) if p]
-            if not title_candidate or len(title_candidate) < 12 or len(path_segments) < 3:
+            if not title or len(title) < 12:
+                continue
+            path_segments = [p for p in PATH_SPLIT_RE.split(link) if p]
+            if len(path_segments) < 3:
                 continue
 
-        title = (a.get_text(" ", strip=True) or "").strip()
         if not title or len(title) < 12:
             parent = a.find_parent(["h1","h2","h3","h4"])
             if parent:
@@ -136,8 +208,6 @@ def collect_candidate_links(root_url="https://www.businesstoday.in/markets/stock
         if not title or len(title) < 12:
             continue
 
-        if link in seen:
-            continue
         seen.add(link)
         links.append({"url": link, "headline": title})
         if len(links) >= max_links:
@@ -147,7 +217,7 @@ def collect_candidate_links(root_url="https://www.businesstoday.in/markets/stock
     if not links:
         home = safe_get("https://www.businesstoday.in")
         if home:
-            s2 = BeautifulSoup(home.text, "html.parser")
+            s2 = BeautifulSoup(home, HTML_PARSER)
             for a in s2.find_all("a", href=True):
                 href = a["href"].strip()
                 if href.startswith("/"):
@@ -158,7 +228,7 @@ def collect_candidate_links(root_url="https://www.businesstoday.in/markets/stock
                     continue
                 if looks_like_high_level_section(link):
                     continue
-                if "businesstoday.in" in link and re.search(r'\d{5,}', link):
+                if "businesstoday.in" in link and DIGITS_RE.search(link):
                     title = (a.get_text(" ", strip=True) or "")
                     if title and len(title) > 10 and link not in seen:
                         seen.add(link)
@@ -168,30 +238,37 @@ def collect_candidate_links(root_url="https://www.businesstoday.in/markets/stock
     print(f"Found {len(links)} candidate links.")
     return links
 
+# Common article containers, in order of preference
+CONTENT_SELECTORS = (
+    'div[itemprop="articleBody"]',
+    'article',
+    'div.story-detail__content',
+    'div.article-content',
+    'div.articleText',
+    'div#articleBody',
+    'div#content',
+    'div.content',
+    'div.blog-content',
+    'div.story-content'
+)
+# One tree walk collects every candidate container; the per-selector matchers
+# only test those few nodes to restore the preference order
+CONTENT_SELECTOR = soupsieve.compile(", ".join(CONTENT_SELECTORS))
+CONTENT_MATCHERS = [soupsieve.compile(sel) for sel in CONTENT_SELECTORS]
+
 # --- extraction with article-page verification ---
 def extract_content_and_time(url):
-    resp = safe_get(url)
-    if not resp:
+    html = safe_get(url, max_bytes=ARTICLE_MAX_BYTES)
+    if not html:
         return None, None
-    soup = BeautifulSoup(resp.text, "html.parser")
+    soup = BeautifulSoup(html, HTML_PARSER)
     drop_boilerplate(soup)
 
     # Try common article containers (ordered)
-    selectors = [
-        'div[itemprop="articleBody"]',
-        'article',
-        'div.story-detail__content',
-        'div.article-content',
-        'div.articleText',
-        'div#articleBody',
-        'div#content',
-        'div.content',
-        'div.blog-content',
-        'div.story-content'
-    ]
+    candidates = CONTENT_SELECTOR.select(soup)
     content = ""
-    for sel in selectors:
-        node = soup.select_one(sel)
+    for matcher in CONTENT_MATCHERS:
+        node = next((el for el in candidates if matcher.match(el)), None)
         if node:
             ps = node.find_all("p")
             if ps:
@@ -216,8 +293,8 @@ def extract_content_and_time(url):
         return None, None
 
     # quick clean
-    content = re.sub(r'\n{3,}', '\n\n', content).strip()
-    content = "\n".join([ln for ln in content.splitlines() if not re.match(r'^\s*Disclaimer\b', ln, re.I)])
+    content = MULTI_NEWLINE_RE.sub('\n\n', content).strip()
+    content = "\n".join([ln for ln in content.splitlines() if not DISCLAIMER_RE.match(ln)])
 
     # Final article detection: skip if page looks like a listing/section
     if not is_article_page(soup, content):
@@ -237,7 +314,7 @@ def extract_content_and_time(url):
 
     if not published:
         # look for "Updated : Oct 18, 2025" style
-        upd = soup.find(string=re.compile(r"Updated\s*[:\-]\s*\w+", re.I))
+        upd = soup.find(string=UPDATED_RE)
         if upd:
             published = upd.strip()
     if not published:
@@ -251,29 +328,22 @@ def extract_content_and_time(url):
 
     return content, published
 
+def extract_many(urls, max_workers=FETCH_WORKERS):
+    """extract_content_and_time for every url, fetched concurrently; results in input order."""
+    if not urls:
+        return []
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(urls))) as executor:
+        return list(executor.map(extract_content_and_time, urls))
+
 def save_json(items, outpath="1_data/raw_articles/businesstoday_latest.json"):
     os.makedirs(os.path.dirname(outpath), exist_ok=True)
-    existing = []
-    existing_urls = set()
-    existing_ids = set()
-    if os.path.exists(outpath):
-        try:
-            with open(outpath, "r", encoding="utf-8") as f:
-                existing = json.load(f)
-                existing_urls = {it.get("url") for it in existing if it.get("url")}
-                existing_ids = {it.get("article_id") for it in existing if it.get("article_id")}
-        except Exception as e:
-            print("Could not load existing file:", e)
-            existing = []
-
-    new = [it for it in items if it["url"] not in existing_urls and it["article_id"] not in existing_ids]
+    # New only if neither url nor article_id was seen before; checked against
+    # the store's .fieldkeys sidecar and appended in place
+    new, _ = append_unseen(outpath, items, drop_if="any")
     if not new:
         print("No new articles to append.")
         return []
 
-    combined = existing + new
-    with open(outpath, "w", encoding="utf-8") as f:
-        json.dump(combined, f, indent=2, ensure_ascii=False)
     print(f"Wrote {len(new)} new article(s) to {outpath}")
     for a in new:
         print(f"- {a['article_id']} | {a['headline'][:80]}")
@@ -286,9 +356,10 @@ def run(max_articles=12):
         print("No candidates found.")
         return
     results = []
-    for c in candidates:
+    extracted = extract_many([c["url"] for c in candidates])
+    scraped_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")  # one stamp for the batch
+    for c, (content, published) in zip(candidates, extracted):
         print("\nProcessing:", c["url"])
-        content, published = extract_content_and_time(c["url"])
         if not content:
             print(" -> Could not extract content, skipping.")
             continue
@@ -299,7 +370,7 @@ def run(max_articles=12):
             "content": content,
             "url": c["url"],
             "published_time": published,
-            "scraped_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "scraped_at": scraped_at,
             "source": "BusinessToday"
         })
     if results:
@@ -1,8 +1,12 @@
 # modules/news_sources/cnbc_tv18.py
-import os, re, json, time, hashlib, sys
+import os, re, json, time, hashlib, sys, atexit, threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone, timedelta
+from functools import lru_cache
 from urllib.parse import urlparse, urlunparse
 
+import requests
+from lxml import etree, html as lxml_html
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
@@ -20,15 +24,55 @@ PROJECT_ROOT = os.path.abspath(
 if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
 
+from modules.cumulative_store import append_unseen, dump_json, parse_json
+from modules.news_sources.rate_limit import RateLimiter
 from config import (
     CNBC_RAW_NEWS_PATH as RAW_NEWS_PATH,
     CNBC_RECENT_NEWS_PATH as RECENT_NEWS_PATH,
+    CHROMEDRIVER_PATH_CACHE,
     LOG_FILE,
     MAX_ARTICLES,
 )
 
 BASE_URL = "https://www.cnbctv18.com/latest-news/"
 SCROLLS = 3
+HEADERS = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36"}
+
+# Article pages carry their headline, JSON-LD, meta tags and <time> in the
+# served HTML, so they are fetched over plain HTTP; only the infinitely
+# scrolled listing page still needs the browser
+SESSION = requests.Session()
+SESSION.headers.update(HEADERS)
+SESSION.mount("https://", requests.adapters.HTTPAdapter(pool_connections=16, pool_maxsize=16))
+
+FETCH_WORKERS = 8  # article pages fetched concurrently
+REQUEST_INTERVAL = 0.5  # seconds between request starts (was a sleep between articles)
+LIMITER = RateLimiter(REQUEST_INTERVAL)
+
+# Every query scrape_article makes, compiled once (tree.xpath(str) recompiles per call)
+H1_XPATH = etree.XPath("//h1")
+TIME_XPATH = etree.XPath("//time")
+JSON_LD_XPATH = etree.XPath('//script[@type="application/ld+json"]/text()')
+PARAGRAPHS_XPATH = etree.XPath(
+    '//div[contains(concat(" ", normalize-space(@class), " "), " article__content ")]//p | //article//p'
+)
+# The listing page only needs its anchors: the browser skips media, fonts and trackers
+BLOCKED_URL_PATTERNS = [
+    "*.jpg", "*.jpeg", "*.png", "*.gif", "*.webp", "*.svg", "*.woff*", "*.ttf", "*.mp4",
+    "*google-analytics*", "*doubleclick*", "*googletagmanager*", "*googlesyndication*",
+]
+
+# href property (absolute, as get_attribute returned it); SVG anchors carry no string href
+ANCHOR_HREFS_JS = (
+    "return Array.from(document.querySelectorAll('a[href]'), a => a.href)"
+    ".filter(h => typeof h === 'string');"
+)
+
+PUBLISHED_META_XPATH = etree.XPath(
+    '//meta[@itemprop="datePublished"]/@content | //meta[@property="article:published_time"]/@content'
+)
+
+ARTICLE_ID_RE = re.compile(r"(\d+)\.htm$")
 
 # ====== Logging ======
 def log(msg: str):
@@ -38,19 +82,26 @@ def log(msg: str):
     print(f"[CNBC-TV18] {msg}")
 
 # ====== Helpers ======
+# Pure functions of the URL, and the listing offers mostly the same links every run
+@lru_cache(maxsize=4096)
 def normalize_url(url: str) -> str:
     p = urlparse(url)
     return urlunparse(p._replace(query="", fragment=""))
 
+@lru_cache(maxsize=4096)
 def get_article_id(url: str) -> str:
     u = normalize_url(url)
-    m = re.search(r"(\d+)\.htm$", u)
-    return m.group(1) if m else hashlib.md5(u.encode("utf-8")).hexdigest()
+    m = ARTICLE_ID_RE.search(u)
+    # md5 is kept for the fallback: these ids are already stored and keyed on downstream
+    return m.group(1) if m else hashlib.md5(u.encode("utf-8"), usedforsecurity=False).hexdigest()
 
 def is_valid_article(url: str) -> bool:
     if not url:
         return False
-    u = normalize_url(url)
+    return is_valid_normalized(normalize_url(url))
+
+def is_valid_normalized(u: str) -> bool:
+    """is_valid_article for a URL that already went through normalize_url."""
     return (
         u.startswith("https://www.cnbctv18.com/") and
         u.endswith(".htm") and
@@ -75,25 +126,80 @@ def fmt_display(dt_ist: datetime) -> str:
 def load_json(path: str):
     if os.path.exists(path):
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                return json.load(f)
+            with open(path, "rb") as f:
+                return parse_json(f.read())
         except Exception as e:
             log(f"JSON load error: {e}")
     return []
 
 def save_json(path: str, data: list):
     os.makedirs(os.path.dirname(path), exist_ok=True)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    with open(path, "wb") as f:
+        f.write(dump_json(data, indent=2))
 
 # ====== Selenium ======
+@lru_cache(maxsize=1)
+def driver_path() -> str:
+    """
+    ChromeDriverManager().install() checks the network on every call: reuse the
+    path it resolved last time (CHROMEDRIVER_PATH_CACHE) while that binary exists.
+    """
+    try:
+        with open(CHROMEDRIVER_PATH_CACHE, "r", encoding="utf-8") as f:
+            cached = f.read().strip()
+        if cached and os.path.isfile(cached):
+            return cached
+    except OSError:
+        pass
+
+    path = ChromeDriverManager().install()
+    try:
+        os.makedirs(os.path.dirname(CHROMEDRIVER_PATH_CACHE), exist_ok=True)
+        with open(CHROMEDRIVER_PATH_CACHE, "w", encoding="utf-8") as f:
+            f.write(path)
+    except OSError as e:
+        log(f"Could not cache chromedriver path: {e}")
+    return path
+
 def make_driver():
     opts = Options()
     opts.add_argument("--headless=new")
     opts.add_argument("--disable-gpu")
     opts.add_argument("--no-sandbox")
     opts.add_argument("--disable-dev-shm-usage")
-    return webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=opts)
+    opts.add_argument("--disable-extensions")
+    opts.add_argument("--disable-background-networking")
+    opts.add_argument("--blink-settings=imagesEnabled=false")
+    opts.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+    driver = webdriver.Chrome(service=Service(driver_path()), options=opts)
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+    except Exception as e:
+        log(f"Could not set blocked URLs: {e}")
+    return driver
+
+# One browser kept for the life of the process and reused by every run,
+# instead of a Chrome start-up per run; cookies are cleared between runs
+_driver = None
+_driver_lock = threading.Lock()
+
+def get_driver():
+    global _driver
+    if _driver is None:
+        _driver = make_driver()
+    else:
+        _driver.delete_all_cookies()
+    return _driver
+
+def close_driver():
+    global _driver
+    if _driver is not None:
+        try: _driver.quit()
+        except: pass
+        _driver = None
+
+atexit.register(close_driver)
 
 def wait_for(driver, selector, by=By.CSS_SELECTOR, timeout=8):
     try:
@@ -111,43 +217,49 @@ def scroll_page(driver, pause=1.0, max_scrolls=SCROLLS):
             break
         h = nh
 
+def element_text(el) -> str:
+    """Text of an element with whitespace collapsed, as the browser's .text rendered it."""
+    return " ".join(el.text_content().split())
+
 # ====== Scraping ======
-def scrape_article(driver, url: str):
+def scrape_article(url: str):
     try:
-        driver.get(url)
-        wait_for(driver, "h1")
+        LIMITER.wait()
+        resp = SESSION.get(url, timeout=10)
+        if resp.status_code != 200:
+            log(f"Non-200 status {resp.status_code} for URL: {url}")
+            return None
+        tree = lxml_html.fromstring(resp.content)
 
         # Headline
-        h1 = driver.find_elements(By.TAG_NAME, "h1")
-        headline = h1[0].text.strip() if h1 else ""
+        h1 = H1_XPATH(tree)
+        headline = element_text(h1[0]) if h1 else ""
         if not headline:
             return None
 
         # Content (prefer JSON-LD articleBody)
         content = ""
-        for sc in driver.find_elements(By.XPATH, '//script[@type="application/ld+json"]'):
+        for raw in JSON_LD_XPATH(tree):
+            # Breadcrumb/WebSite/Organization blocks carry no body: skip them unparsed
+            if "articleBody" not in raw:
+                continue
             try:
-                data = json.loads(sc.get_attribute("innerHTML"))
+                data = json.loads(raw)
                 if isinstance(data, dict) and data.get("articleBody"):
                     content = str(data["articleBody"]).strip()
                     break
             except:
                 pass
         if not content:
-            paras = driver.find_elements(By.CSS_SELECTOR, "div.article__content p, article p")
-            content = " ".join([p.text for p in paras if p.text.strip()])
+            paras = [element_text(p) for p in PARAGRAPHS_XPATH(tree)]
+            content = " ".join([t for t in paras if t])
 
         # Published time
-        published_raw = None
-        for mt in driver.find_elements(By.CSS_SELECTOR, 'meta[itemprop="datePublished"], meta[property="article:published_time"]'):
-            c = mt.get_attribute("content")
-            if c:
-                published_raw = c
-                break
+        published_raw = next((c for c in PUBLISHED_META_XPATH(tree) if c), None)
         if not published_raw:
-            tnodes = driver.find_elements(By.TAG_NAME, "time")
+            tnodes = TIME_XPATH(tree)
             if tnodes:
-                published_raw = tnodes[0].get_attribute("datetime") or tnodes[0].text
+                published_raw = tnodes[0].get("datetime") or element_text(tnodes[0])
         if not published_raw:
             return None
 
@@ -160,11 +272,12 @@ def scrape_article(driver, url: str):
         if not is_today_ist_dt(dt_ist):
             return None  # only keep *today* items
 
+        u = normalize_url(url)
         return {
-            "article_id": get_article_id(url),
+            "article_id": get_article_id(u),
             "headline": headline,
             "content": content.strip(),
-            "url": normalize_url(url),
+            "url": u,
             "published_time": fmt_display(dt_ist),   # 'HH:MM AM/PM | DD Mon YYYY'
             "scraped_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
             "source": "CNBC-TV18",
@@ -178,18 +291,20 @@ def fetch_latest_links(driver):
     wait_for(driver, "a")
     scroll_page(driver, pause=1.0, max_scrolls=SCROLLS)
 
-    anchors = driver.find_elements(By.TAG_NAME, "a")
+    # Every href in one script call instead of a WebDriver round-trip per anchor
+    hrefs = driver.execute_script(ANCHOR_HREFS_JS) or []
     links, seen = [], set()
-    for a in anchors:
+    for href in hrefs:
+        if not href:
+            continue
+        # Normalize once; repeats are dropped before the validity checks
         try:
-            href = a.get_attribute("href")
-            if is_valid_article(href):
-                u = normalize_url(href)
-                if u not in seen:
-                    links.append(u)
-                    seen.add(u)
-        except:
-            pass
+            u = normalize_url(href)
+        except ValueError:  # malformed netloc, e.g. an unclosed "["
+            continue
+        if u not in seen and is_valid_normalized(u):
+            links.append(u)
+            seen.add(u)
     return links
 
 # ====== Persist (per-source RAW+RECENT with dedup) ======
@@ -205,24 +320,17 @@ def _clear_recent():
 
 def save_articles_to_json(articles_data):
     os.makedirs(os.path.dirname(RAW_NEWS_PATH), exist_ok=True)
-    existing = load_json(RAW_NEWS_PATH)
-    existing_urls = {it.get("url") for it in existing}
-    existing_ids  = {it.get("article_id") for it in existing}
 
     # Dedup rule: drop only if BOTH url AND article_id already exist
-    new_articles = [
-        a for a in articles_data
-        if not (a["url"] in existing_urls and a["article_id"] in existing_ids)
-    ]
+    # (checked against the store's .fieldkeys sidecar; new articles are appended in place)
+    new_articles, total = append_unseen(RAW_NEWS_PATH, articles_data)
 
     if not new_articles:
         log("🟡 No new CNBC-TV18 articles to append (dedup).")
         _clear_recent()
         return []
 
-    all_data = existing + new_articles
-    save_json(RAW_NEWS_PATH, all_data)
-    log(f"💾 JSON updated: {RAW_NEWS_PATH} (+{len(new_articles)} new, total {len(all_data)})")
+    log(f"💾 JSON updated: {RAW_NEWS_PATH} (+{len(new_articles)} new, total {total})")
 
     _save_recent(new_articles)
     return new_articles
@@ -230,37 +338,43 @@ def save_articles_to_json(articles_data):
 # ====== Public entrypoint (contract) ======
 def fetch_and_save_articles(max_articles: int = MAX_ARTICLES):
     log("📡 Fetching CNBC-TV18 Latest News (today IST only)…")
-    driver = make_driver()
-    try:
-        links = fetch_latest_links(driver)
-        if not links:
-            log("❌ No links found.")
-            _clear_recent()
-            return []
-
-        batch = []
-        for url in links:
+    # The browser is only needed for the listing
+    with _driver_lock:
+        try:
+            links = fetch_latest_links(get_driver())
+        except Exception as e:
+            # A long-lived session can go stale (crashed/closed browser): restart it once
+            log(f"⚠️ Browser session failed ({e}); restarting it")
+            close_driver()
+            links = fetch_latest_links(get_driver())
+
+    if not links:
+        log("❌ No links found.")
+        _clear_recent()
+        return []
+
+    # Scrape in chunks of FETCH_WORKERS, in link order, until max_articles are
+    # kept: the same articles as the sequential loop, at most one chunk of extra fetches
+    batch = []
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as executor:
+        for start in range(0, len(links), FETCH_WORKERS):
             if len(batch) >= max_articles:
                 break
-            rec = scrape_article(driver, url)
-            if rec:
-                batch.append(rec)
-            time.sleep(0.5)
-
-        if not batch:
-            log("ℹ️ No valid 'today' articles.")
-            _clear_recent()
-            return []
-
-        # Oldest first for stable writes
-        def parse_disp(disp: str) -> datetime:
-            return datetime.strptime(disp, "%I:%M %p | %d %b %Y")
-        batch.sort(key=lambda a: parse_disp(a["published_time"]))
-
-        return save_articles_to_json(batch)
-    finally:
-        try: driver.quit()
-        except: pass
+            for rec in executor.map(scrape_article, links[start:start + FETCH_WORKERS]):
+                if rec and len(batch) < max_articles:
+                    batch.append(rec)
+
+    if not batch:
+        log("ℹ️ No valid 'today' articles.")
+        _clear_recent()
+        return []
+
+    # Oldest first for stable writes
+    def parse_disp(disp: str) -> datetime:
+        return datetime.strptime(disp, "%I:%M %p | %d %b %Y")
+    batch.sort(key=lambda a: parse_disp(a["published_time"]))
+
+    return save_articles_to_json(batch)
 
 if __name__ == "__main__":
     added = fetch_and_save_articles()
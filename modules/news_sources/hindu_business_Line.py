@@ -1,16 +1,47 @@
 import requests
+import json
 from bs4 import BeautifulSoup
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import os
-import json
 import re
 import time
 import hashlib
+from concurrent.futures import ThreadPoolExecutor
+
+from modules.cumulative_store import append_unseen
+from modules.news_sources.line_filter import compile_line_union, strip_lines_by_regexes
+from modules.news_sources.rate_limit import RateLimiter
+
+# Optional: lxml's C parser builds the soup several times faster than html.parser
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
 
 # --- Global Configuration ---
 HEADERS = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"}
 BL_LATEST_NEWS_URL = "https://www.thehindubusinessline.com/latest-news/"
+BL_BASE_URL = "https://www.thehindubusinessline.com"
 TARGET_TIME_FORMAT = '%B %d, %Y at %I:%M %p' 
+IST = timezone(timedelta(hours=5, minutes=30))  # fixed offset: India has no DST
+# Published-time meta tags, tried in order, with their log label
+META_TIME_TAGS = (
+    ({"property": "article:published_time"}, "Meta tag"),
+    ({"name": "publish-date"}, "Alternative meta tag"),
+)
+
+# One pooled session per source: keep-alive connections are reused across the
+# index page and every article page instead of a new TCP+TLS handshake per GET
+SESSION = requests.Session()
+SESSION.headers.update(HEADERS)
+
+FETCH_WORKERS = 8  # article pages fetched concurrently
+REQUEST_INTERVAL = 0.5  # seconds between request starts, shared by all threads
+LIMITER = RateLimiter(REQUEST_INTERVAL)
+
+# Validators and parsed headlines of the last latest-news download, for a conditional GET
+INDEX_CACHE_PATH = "1_data/.bl_index_cache.json"
 # ---
 
 # =========================
@@ -23,12 +54,16 @@ def log(msg):
     with open("logs/bl_scrape_log.txt", "a", encoding="utf-8") as f:
         f.write(f"{datetime.now().strftime('%Y-%m-%d %H:%M:%S')} | {msg}\n")
 
-def safe_get(url, max_retries=3, timeout=10):
-    """Performs an HTTP GET request with retries and exponential backoff."""
+def safe_get(url, max_retries=3, timeout=10, headers=None):
+    """
+    Performs an HTTP GET request with retries and exponential backoff.
+    A 304 is returned as-is; it only comes back for a conditional request (headers).
+    """
     for i in range(max_retries):
         try:
-            response = requests.get(url, headers=HEADERS, timeout=timeout)
-            if response.status_code == 200:
+            LIMITER.wait()
+            response = SESSION.get(url, timeout=timeout, headers=headers)
+            if response.status_code in (200, 304):
                 return response
             else:
                 log(f"Non-200 status {response.status_code} for URL: {url}")
@@ -66,37 +101,49 @@ BL_BOILERPLATE_REGEXES = [
     r"(?i)^\s*istock\.com\s*$",
 ]
 
+# All patterns compiled once at import
+DISCLAIMER_UNION_RE = compile_line_union(DISCLAIMER_REGEXES)
+BL_BOILERPLATE_UNION_RE = compile_line_union(BL_BOILERPLATE_REGEXES)
+# Both line filters in one pass: each only drops whole lines, so the order they ran in never mattered
+CONTENT_LINE_UNION_RE = compile_line_union(DISCLAIMER_REGEXES + BL_BOILERPLATE_REGEXES)
+DISCLAIMER_TAG_RE = re.compile(r"^\s*Disclaimer\b", re.I)
+MULTI_NEWLINE_RE = re.compile(r"\n\n\n+")  # same as \n{3,}, but the literal prefix lets the engine skip ahead
+MULTI_SPACE_RE = re.compile(r"\s{2,}")
+ARTICLE_ID_RE = re.compile(r'article(\d+)\.ece')
+CONTAINER_CLASS_RE = re.compile(r"article|story|news|item", re.I)
+TITLE_CLASS_RE = re.compile(r"title|headline", re.I)
+CONTAINER_SKIP_PREFIXES = ('read', 'click', 'more', 'view')
+LINK_SKIP_PREFIXES = CONTAINER_SKIP_PREFIXES + ('subscribe',)
+STOCK_MARKET_START_RE = re.compile(r'S\s*tock Market today', re.I)
+STOCK_MARKET_INTRO_RE = re.compile(r'S\s*tock Market today.*?for \d{1,2}th\s+\w+\s+\d{4}', re.DOTALL | re.I)
+# The (?=[UuPp]) lookahead lets the engine skip positions that cannot start a match
+RAW_TIME_RE = re.compile(
+    r'(?=[UuPp])(?:Updated|Published on|Published)\s*[-—:]?\s*([A-Za-z]+\s+\d{1,2},\s*\d{4})\s*(?:at\s*(\d{1,2}:\d{2})\s*(AM|PM|am|pm))?',
+    re.I
+)
+NEARBY_TIME_RE = re.compile(r'(\d{1,2}:\d{2})\s*(AM|PM|am|pm)', re.I)
+RAW_TIME_WINDOW = 50_000  # the visible timestamp sits near the top of the page
+RAW_TIME_MARGIN = 200  # a match ending this far inside the window cannot run on past it
+
 def drop_disclaimer_nodes(soup: BeautifulSoup) -> None:
     """Removes HTML nodes commonly containing disclaimers, ads, or comment sections."""
     for el in soup.select(DISCLAIMER_CLASS_SELECTORS):
         el.decompose()
-    for tag in soup.find_all(["p", "div", "span", "li"], string=re.compile(r"^\s*Disclaimer\b", re.I)):
+    for tag in soup.find_all(["p", "div", "span", "li"], string=DISCLAIMER_TAG_RE):
         try:
             tag.decompose()
         except Exception:
             pass
 
-def strip_lines_by_regexes(text: str, regex_list) -> str:
-    """Strips lines from text if they match any of the provided regexes."""
-    if not text:
-        return text
-    lines = [ln.strip() for ln in text.split("\n")]
-    kept = []
-    for ln in lines:
-        if not ln:
-            continue
-        if any(re.search(rx, ln) for rx in regex_list):
-            continue
-        kept.append(ln)
-    out = "\n".join(kept)
-    out = re.sub(r"\n{3,}", "\n\n", out).strip()
-    return out
-
 def strip_disclaimer_lines(text: str) -> str:
-    return strip_lines_by_regexes(text, DISCLAIMER_REGEXES)
+    return strip_lines_by_regexes(text, DISCLAIMER_UNION_RE)
 
 def strip_bl_boilerplate(text: str) -> str:
-    return strip_lines_by_regexes(text, BL_BOILERPLATE_REGEXES)
+    return strip_lines_by_regexes(text, BL_BOILERPLATE_UNION_RE)
+
+def strip_content_lines(text: str) -> str:
+    """strip_disclaimer_lines and strip_bl_boilerplate in a single pass."""
+    return strip_lines_by_regexes(text, CONTENT_LINE_UNION_RE)
 
 # =========================
 # The Hindu Business Line Specific Logic
@@ -107,11 +154,34 @@ def extract_bl_article_id(url):
     Extracts the numerical article ID from the URL (e.g., 70108651) 
     or falls back to MD5 hash if no number is found.
     """
-    match = re.search(r'article(\d+)\.ece', url)
+    match = ARTICLE_ID_RE.search(url)
     if match:
         return match.group(1) 
     
-    return hashlib.md5(url.encode()).hexdigest()
+    # Stays md5 (stored ids must not change); usedforsecurity=False marks it as a plain fingerprint
+    return hashlib.md5(url.encode(), usedforsecurity=False).hexdigest()
+
+# Comprehensive list of categories (including new ones found)
+HEADLINE_CATEGORIES = [
+    "Markets", "Stocks", "News", "Companies", "Economy", "Personal Finance",
+    "Agri Business", "Education", "National", "Commodity Calls", "Commodities",
+    "Info-tech", "Money & Banking", "Gold & Silver", "World", "Opinion",
+    "Portfolio", "Technical Analysis", "Pulse"
+]
+# Escape special regex characters in category names and join with |
+_categories_pattern = "|".join(re.escape(cat) for cat in HEADLINE_CATEGORIES)
+
+# Leading "HH:MM | Mon DD, YYYY" stamp (with trailing spaces)
+_time_pattern = r'\d{1,2}:\d{2}\s*\|\s*[A-Za-z]+\s+\d{1,2},\s*\d{4}\s*'
+
+# One anchored pass doing what used to be three sequential subs, in the same order:
+#   CategoryName + optional spaces + stamp ("Markets 10:59 | Nov 17, 2025")
+#   then, only after that, a second CategoryName+stamp with no space ("Markets10:59")
+#   then any remaining bare stamp at the start
+HEADLINE_PREFIX_RE = re.compile(
+    rf'^(?:(?:{_categories_pattern})\s*{_time_pattern}(?:(?:{_categories_pattern}){_time_pattern})?)?(?:{_time_pattern})?',
+    re.I
+)
 
 def clean_headline(headline):
     """
@@ -125,143 +195,149 @@ def clean_headline(headline):
     if not headline:
         return headline
     
-    # Comprehensive list of categories (including new ones found)
-    categories = [
-        "Markets", "Stocks", "News", "Companies", "Economy", "Personal Finance",
-        "Agri Business", "Education", "National", "Commodity Calls", "Commodities",
-        "Info-tech", "Money & Banking", "Gold & Silver", "World", "Opinion",
-        "Portfolio", "Technical Analysis", "Pulse"
-    ]
-    
-    # Escape special regex characters in category names and join with |
-    categories_pattern = "|".join(re.escape(cat) for cat in categories)
-    
-    # Pattern to match: CategoryName + Time (HH:MM | Mon DD, YYYY) + Headline
-    # Handle both cases: with/without spaces between category, time, and date
-    # This regex matches: CategoryName + HH:MM | Mon DD, YYYY (with optional spaces)
-    headline = re.sub(
-        rf'^({categories_pattern})\s*\d{{1,2}}:\d{{2}}\s*\|\s*[A-Za-z]+\s+\d{{1,2}},\s*\d{{4}}\s*',
-        '',
-        headline,
-        flags=re.IGNORECASE
-    )
-    
-    # Also handle cases where there's no space between category and time (e.g., "Markets10:59")
-    headline = re.sub(
-        rf'^({categories_pattern})\d{{1,2}}:\d{{2}}\s*\|\s*[A-Za-z]+\s+\d{{1,2}},\s*\d{{4}}\s*',
-        '',
-        headline,
-        flags=re.IGNORECASE
-    )
-    
-    # Remove any remaining timestamp patterns at the start: "HH:MM | Mon DD, YYYY"
-    headline = re.sub(
-        r'^\d{1,2}:\d{2}\s*\|\s*[A-Za-z]+\s+\d{1,2},\s*\d{4}\s*',
-        '',
-        headline,
-        flags=re.IGNORECASE
-    )
+    headline = HEADLINE_PREFIX_RE.sub('', headline, count=1)
     
     return headline.strip()
 
+def absolute_bl_link(href):
+    return href if href.startswith("http") else BL_BASE_URL + href
+
+def is_bl_article_link(link):
+    """
+    Any article URL ending with .ece from thehindubusinessline.com, from all sections;
+    the latest-news listing page itself is excluded.
+    """
+    return (
+        link.endswith(".ece")
+        and "thehindubusinessline.com" in link
+        and "/latest-news/" not in link
+    )
+
+def load_index_cache():
+    try:
+        with open(INDEX_CACHE_PATH, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+        return cache if isinstance(cache, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+def save_index_cache(response, max_articles, articles):
+    """Remember the page's validators with the headlines parsed from it (nothing to keep without validators)."""
+    etag, last_modified = response.headers.get("ETag"), response.headers.get("Last-Modified")
+    if not etag and not last_modified:
+        return
+    cache = {"etag": etag, "last_modified": last_modified, "max_articles": max_articles, "articles": articles}
+    try:
+        os.makedirs(os.path.dirname(INDEX_CACHE_PATH), exist_ok=True)
+        tmp_path = INDEX_CACHE_PATH + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(cache, f, ensure_ascii=False)
+        os.replace(tmp_path, INDEX_CACHE_PATH)
+    except OSError as e:
+        log(f"Could not write index cache: {e}")
+
+def conditional_headers(cache, max_articles):
+    """If-None-Match / If-Modified-Since from the cache, when its headlines cover max_articles."""
+    headers = {}
+    if cache.get("articles") is not None and cache.get("max_articles", 0) >= max_articles:
+        if cache.get("etag"):
+            headers["If-None-Match"] = cache["etag"]
+        if cache.get("last_modified"):
+            headers["If-Modified-Since"] = cache["last_modified"]
+    return headers or None
+
 def fetch_bl_headlines(max_articles=10):
     """Fetches article headlines and URLs from The Hindu Business Line Latest News page."""
     print(f"Attempting to fetch {max_articles} headlines from: {BL_LATEST_NEWS_URL}")
     try:
-        response = safe_get(BL_LATEST_NEWS_URL)
+        cache = load_index_cache()
+        response = safe_get(BL_LATEST_NEWS_URL, headers=conditional_headers(cache, max_articles))
         if not response:
             log("❌ Failed to fetch BL latest news page.")
             return []
+        if response.status_code == 304:
+            # Unchanged since the last run: its parsed headlines still stand (a shorter
+            # limit gives a prefix of them, as the loops below fill the list in page order)
+            log("BL latest news page not modified; reusing its cached headlines.")
+            return cache["articles"][:max_articles]
 
-        soup = BeautifulSoup(response.text, "html.parser")
+        soup = BeautifulSoup(response.text, HTML_PARSER)
         articles, seen_links = [], set()
 
+        def accept(link, title, skip_prefixes):
+            """Keep a cleaned headline that reads like a real title; True once the list is full."""
+            if title and len(title) > 20 and not title.lower().startswith(skip_prefixes):
+                seen_links.add(link)
+                articles.append({"headline": title, "url": link})
+            return len(articles) >= max_articles
+
         # Try to find article containers first (more structured approach)
         # Look for common article patterns: article tags, divs with article classes, list items
         article_containers = (
             soup.find_all("article") +
-            soup.find_all("div", class_=re.compile(r"article|story|news|item", re.I)) +
-            soup.find_all("li", class_=re.compile(r"article|story|news|item", re.I))
+            soup.find_all("div", class_=CONTAINER_CLASS_RE) +
+            soup.find_all("li", class_=CONTAINER_CLASS_RE)
         )
-        
-        # If we found containers, extract from them
-        if article_containers:
-            for container in article_containers:
-                if len(articles) >= max_articles:
-                    break
-                    
-                # Find link in container
-                link_tag = container.find("a", href=True)
-                if not link_tag:
-                    continue
-                    
-                link = link_tag["href"]
-                if not link.startswith("http"):
-                    link = "https://www.thehindubusinessline.com" + link
-
-                # Check if it's a valid article link
-                # Accept any article URL ending with .ece from thehindubusinessline.com
-                # Exclude non-article pages (homepage, category listings, etc.)
-                is_valid_article = (
-                    link.endswith(".ece")
-                    and "thehindubusinessline.com" in link
-                    and link not in seen_links
-                    and "/latest-news/" not in link  # Exclude the listing page itself
-                    and not link.endswith("/latest-news/")
-                )
-                
-                if is_valid_article:
-                    title = link_tag.get_text(strip=True)
-                    # Also try to find title in h1, h2, h3, or title attribute
-                    if not title or len(title) < 20:
-                        title_elem = container.find(["h1", "h2", "h3", "h4"], class_=re.compile(r"title|headline", re.I))
-                        if title_elem:
-                            title = title_elem.get_text(strip=True)
-                    
-                    # Clean the headline to remove category and timestamp prefixes
-                    title = clean_headline(title)
-                    
-                    if title and len(title) > 20 and not title.lower().startswith(('read', 'click', 'more', 'view')):
-                        seen_links.add(link)
-                        articles.append({"headline": title, "url": link})
-        
+
+        for container in article_containers:
+            if len(articles) >= max_articles:
+                break
+
+            # Find link in container
+            link_tag = container.find("a", href=True)
+            if not link_tag:
+                continue
+
+            link = absolute_bl_link(link_tag["href"])
+            if link in seen_links or not is_bl_article_link(link):
+                continue
+
+            title = link_tag.get_text(strip=True)
+            # Also try to find title in h1, h2, h3, or title attribute
+            if not title or len(title) < 20:
+                title_elem = container.find(["h1", "h2", "h3", "h4"], class_=TITLE_CLASS_RE)
+                if title_elem:
+                    title = title_elem.get_text(strip=True)
+
+            # Clean the headline to remove category and timestamp prefixes
+            if accept(link, clean_headline(title), CONTAINER_SKIP_PREFIXES):
+                break
+
         # Fallback: if we didn't find enough articles via containers, use the original method
         if len(articles) < max_articles:
-            all_links = soup.find_all("a", href=True)
-            
-            for a_tag in all_links:
-                if len(articles) >= max_articles:
+            for a_tag in soup.find_all("a", href=True):
+                link = absolute_bl_link(a_tag["href"])
+                # Link checks first: most anchors are not articles, and they never need a headline
+                if link in seen_links or not is_bl_article_link(link):
+                    continue
+                if accept(link, clean_headline(a_tag.get_text(strip=True)), LINK_SKIP_PREFIXES):
                     break
-                    
-                link = a_tag["href"]
-                if not link.startswith("http"):
-                    link = "https://www.thehindubusinessline.com" + link
 
-                title = a_tag.get_text(strip=True)
-                
-                # Clean the headline to remove category and timestamp prefixes
-                title = clean_headline(title)
-
-                # Updated filter: accept any article ending with .ece from thehindubusinessline.com
-                # This will catch articles from ALL sections, not just the listed ones
-                is_valid_article = (
-                    link.endswith(".ece")
-                    and "thehindubusinessline.com" in link
-                    and link not in seen_links
-                    and "/latest-news/" not in link  # Exclude the listing page itself
-                    and not link.endswith("/latest-news/")
-                )
-                
-                if is_valid_article:
-                    if title and len(title) > 20 and not title.lower().startswith(('read', 'click', 'more', 'view', 'subscribe')):
-                        seen_links.add(link)
-                        articles.append({"headline": title, "url": link})
-        
+        save_index_cache(response, max_articles, articles)
         return articles
     except Exception as e:
         log(f"⚠️ fetch_bl_headlines error: {e}")
         return []
 
+def search_page_head(pattern, text):
+    """
+    pattern.search(text), trying the first RAW_TIME_WINDOW characters before the
+    whole page; a window match is only trusted if it ends clear of the cut.
+    """
+    head = text[:RAW_TIME_WINDOW]
+    if len(head) < len(text):
+        match = pattern.search(head)
+        if match and match.end() <= len(head) - RAW_TIME_MARGIN:
+            return match
+    return pattern.search(text)
+
+def format_meta_time(meta_content):
+    """A meta tag's ISO timestamp in TARGET_TIME_FORMAT; UTC ("Z") stamps are shown in IST."""
+    meta_content = meta_content.strip()
+    if meta_content.endswith('Z'):
+        return datetime.fromisoformat(meta_content[:-1] + '+00:00').astimezone(IST).strftime(TARGET_TIME_FORMAT)
+    return datetime.fromisoformat(meta_content.replace('Z', '+00:00')).strftime(TARGET_TIME_FORMAT)
+
 def fetch_full_bl_article(url):
     """Fetches the full content and published time for a Business Line article."""
     
@@ -273,7 +349,9 @@ def fetch_full_bl_article(url):
         if not response:
             return None, None
 
-        soup = BeautifulSoup(response.text, "html.parser")
+        # resp.text re-decodes the body on every access; decode once
+        page_text = response.text
+        soup = BeautifulSoup(page_text, HTML_PARSER)
 
         # 1. Content Extraction & Cleaning
         drop_disclaimer_nodes(soup)
@@ -290,25 +368,20 @@ def fetch_full_bl_article(url):
         if len(content) < 50:
             return None, None
 
-        content = strip_disclaimer_lines(content)
-        content = strip_bl_boilerplate(content) 
+        content = strip_content_lines(content)
 
-        start_marker_match = re.search(r'S\s*tock Market today', content, flags=re.IGNORECASE)
+        start_marker_match = STOCK_MARKET_START_RE.search(content)
         if start_marker_match:
             content = content[start_marker_match.start():]
-            content = re.sub(r'S\s*tock Market today.*?for \d{1,2}th\s+\w+\s+\d{4}', '', content, flags=re.DOTALL | re.IGNORECASE).strip()
-            content = re.sub(r"\n{3,}", "\n\n", content).strip()
+            content = STOCK_MARKET_INTRO_RE.sub('', content).strip()
+            content = MULTI_NEWLINE_RE.sub("\n\n", content).strip()
 
 
         # 4. Extract Published time (Final Logic Block)
         
         # --- PRIORITY 1: Search the VISIBLE text in the RAW HTML FIRST (Matches what users see, IST time) ---
         # Updated regex to match: "Updated - November 13, 2025 at 08:34 PM"
-        raw_time_match = re.search(
-            r'(?:Updated|Published on|Published)\s*[-—:]?\s*([A-Za-z]+\s+\d{1,2},\s*\d{4})\s*(?:at\s*(\d{1,2}:\d{2})\s*(AM|PM|am|pm))?',
-            response.text, 
-            flags=re.IGNORECASE
-        )
+        raw_time_match = search_page_head(RAW_TIME_RE, page_text)
         
         if raw_time_match:
             date_part = raw_time_match.group(1).strip()
@@ -325,8 +398,8 @@ def fetch_full_bl_article(url):
                 else:
                     # Only date found - check nearby text for time
                     match_pos = raw_time_match.end()
-                    nearby_text = response.text[max(0, match_pos-50):match_pos+200]
-                    time_nearby = re.search(r'(\d{1,2}:\d{2})\s*(AM|PM|am|pm)', nearby_text, flags=re.IGNORECASE)
+                    nearby_text = page_text[max(0, match_pos-50):match_pos+200]
+                    time_nearby = NEARBY_TIME_RE.search(nearby_text)
                     if time_nearby:
                         time_str = time_nearby.group(1)
                         ampm_str = time_nearby.group(2).upper()
@@ -338,42 +411,13 @@ def fetch_full_bl_article(url):
                 log(f"Visible text time parse failed for {url}: {e}")
         
         # --- PRIORITY 2: Fallback to Metadata Tags (if visible text doesn't have time) ---
-        meta_pub = soup.find("meta", attrs={"property": "article:published_time"})
-        if meta_pub and meta_pub.get("content"):
-            try:
-                meta_content = meta_pub["content"].strip()
-                # Convert UTC (Z) to IST (UTC+5:30)
-                if meta_content.endswith('Z'):
-                    meta_content = meta_content[:-1] + '+00:00'
-                    dt_obj = datetime.fromisoformat(meta_content)
-                    # Add 5 hours 30 minutes to convert UTC to IST
-                    dt_obj = dt_obj + timedelta(hours=5, minutes=30)
-                    published_time = dt_obj.strftime(TARGET_TIME_FORMAT)
-                    return content, published_time
-                else:
-                    dt_obj = datetime.fromisoformat(meta_content.replace('Z', '+00:00'))
-                    published_time = dt_obj.strftime(TARGET_TIME_FORMAT)
-                    return content, published_time
-            except Exception as e:
-                log(f"Meta tag parse failed for {url}: {e}")
-        
-        # Try alternative meta tag
-        meta_pub_alt = soup.find("meta", attrs={"name": "publish-date"})
-        if meta_pub_alt and meta_pub_alt.get("content"):
-            try:
-                meta_content = meta_pub_alt["content"].strip()
-                if meta_content.endswith('Z'):
-                    meta_content = meta_content[:-1] + '+00:00'
-                    dt_obj = datetime.fromisoformat(meta_content)
-                    dt_obj = dt_obj + timedelta(hours=5, minutes=30)  # Convert to IST
-                    published_time = dt_obj.strftime(TARGET_TIME_FORMAT)
-                    return content, published_time
-                else:
-                    dt_obj = datetime.fromisoformat(meta_content.replace('Z', '+00:00'))
-                    published_time = dt_obj.strftime(TARGET_TIME_FORMAT)
-                    return content, published_time
-            except Exception as e:
-                log(f"Alternative meta tag parse failed for {url}: {e}")
+        for attrs, label in META_TIME_TAGS:
+            meta_pub = soup.find("meta", attrs=attrs)
+            if meta_pub and meta_pub.get("content"):
+                try:
+                    return content, format_meta_time(meta_pub["content"])
+                except Exception as e:
+                    log(f"{label} parse failed for {url}: {e}")
         
         # --- PRIORITY 3: Last resort - use date only if found ---
         if raw_time_match:
@@ -402,32 +446,14 @@ def save_articles_to_json(articles_data):
     os.makedirs("1_data/raw_articles", exist_ok=True)
     filename = "1_data/raw_articles/hindubusinessline_latest.json"
 
-    existing_urls = set()
-    existing_article_ids = set()
-    existing_data = []
-
-    if os.path.exists(filename):
-        with open(filename, "r", encoding="utf-8") as f:
-            try:
-                existing_data = json.load(f)
-                existing_urls = {item.get("url") for item in existing_data}
-                existing_article_ids = {item.get("article_id") for item in existing_data}
-            except Exception:
-                log(f"⚠️ Error loading existing JSON file: {filename}. Starting fresh.")
-                existing_data = []
-
-    new_articles = [
-        a for a in articles_data
-        if a["url"] not in existing_urls and a["article_id"] not in existing_article_ids
-    ]
+    # New only if neither url nor article_id was seen before; only the ids are
+    # looked up (in the store's .fieldkeys sidecar), and new articles are appended in place
+    new_articles, _ = append_unseen(filename, articles_data, drop_if="any")
 
     if not new_articles:
         print("\n🟡 No new Hindu Business Line articles to append (URL/ID deduplication).")
         return []
 
-    all_data = existing_data + new_articles
-    with open(filename, "w", encoding="utf-8") as f:
-        json.dump(all_data, f, indent=2, ensure_ascii=False)
     print(f"\n💾 JSON updated: {filename} ({len(new_articles)} new)")
 
     print("\n✅ Newly added Hindu Business Line articles:")
@@ -454,17 +480,19 @@ def fetch_and_save_articles(max_articles=10):
         return
 
     print(f"Starting content fetch for {len(articles)} articles...")
-    for i, article in enumerate(articles, 1):
+    # Pages are fetched concurrently (throttled by LIMITER); results are reported in order
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as executor:
+        fetched = list(executor.map(fetch_full_bl_article, [a["url"] for a in articles]))
+
+    scraped_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    for i, (article, (content, published_time)) in enumerate(zip(articles, fetched), 1):
         print(f"\n🔹 Processing Article {i}/{len(articles)}")
         print(f"📰 {article['headline']}")
         print(f"🔗 {article['url']}")
 
-        time.sleep(1)
-
-        content, published_time = fetch_full_bl_article(article["url"])
         if content:
             article_id = extract_bl_article_id(article["url"])
-            preview = re.sub(r"\s{2,}", " ", content.replace("\n", " ")).strip()
+            preview = MULTI_SPACE_RE.sub(" ", content.replace("\n", " ")).strip()
             print(f"🆔 Article ID: {article_id}")
             print(f"🕒 Published: {published_time}")
             print(f"📄 Preview: {preview[:100]}...\n")
@@ -475,7 +503,7 @@ def fetch_and_save_articles(max_articles=10):
                 "content": content,
                 "url": article["url"],
                 "published_time": published_time,
-                "scraped_at": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                "scraped_at": scraped_at,
                 "source": "The Hindu Business Line"
             })
         else:
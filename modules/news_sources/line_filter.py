@@ -0,0 +1,35 @@
+"""
+Line Filter Module
+
+Line-level boilerplate stripping shared by the scrapers: a list of ^-anchored
+line regexes is compiled into one alternation, and each stripped line of the
+article text is tested against it once with .match.
+"""
+
+import re
+
+
+def compile_line_union(regex_list):
+    """
+    One pattern matching wherever any regex in the list would: a single test
+    per line instead of one per regex. A leading (?i) becomes a scoped (?i:...)
+    group, since global flags are only allowed at the start of a pattern.
+    Every regex must be anchored with ^, so lines can be tested with .match:
+    .search would retry the anchor at every position of every line.
+    """
+    parts = []
+    for rx in regex_list:
+        flags, body = ("?i:", rx[4:]) if rx.startswith("(?i)") else ("?:", rx)
+        if not body.startswith("^"):
+            raise ValueError(f"line regex must start with ^: {rx!r}")
+        parts.append(f"({flags}{body})")
+    return re.compile("|".join(parts))
+
+
+def strip_lines_by_regexes(text: str, union_re) -> str:
+    """Strips lines from text if they match the compiled union of line regexes (see compile_line_union)."""
+    if not text:
+        return text
+    # Lines are non-empty after filtering, so the joined text has no blank runs to collapse
+    kept = [ln for ln in (raw.strip() for raw in text.split("\n")) if ln and not union_re.match(ln)]
+    return "\n".join(kept).strip()
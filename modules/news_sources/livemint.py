@@ -3,10 +3,11 @@ from bs4 import BeautifulSoup
 from datetime import datetime
 import re
 import os
-import json
 import time
 import hashlib
 
+from modules.cumulative_store import append_unseen, dump_json
+from modules.news_sources.line_filter import compile_line_union, strip_lines_by_regexes
 from config import (
     LIVEMINT_RAW_NEWS_PATH as RAW_NEWS_PATH,
     LIVEMINT_RECENT_NEWS_PATH as RECENT_NEWS_PATH,
@@ -16,6 +17,11 @@ from config import (
 
 headers = {"User-Agent": "Mozilla/5.0"}
 
+# One pooled session per source: keep-alive connections are reused across the
+# index page and every article page instead of a new TCP+TLS handshake per GET
+session = requests.Session()
+session.headers.update(headers)
+
 def log(msg):
     os.makedirs(os.path.dirname(LOG_FILE), exist_ok=True)
     with open(LOG_FILE, "a", encoding="utf-8") as f:
@@ -25,7 +31,7 @@ def log(msg):
 def safe_get(url, max_retries=3, timeout=10):
     for i in range(max_retries):
         try:
-            response = requests.get(url, headers=headers, timeout=timeout)
+            response = session.get(url, timeout=timeout)
             if response.status_code == 200:
                 return response
             else:
@@ -41,14 +47,14 @@ def extract_article_id(url):
 
 def save_recent_json(new_articles):
     os.makedirs(os.path.dirname(RECENT_NEWS_PATH), exist_ok=True)
-    with open(RECENT_NEWS_PATH, "w", encoding="utf-8") as f:
-        json.dump(new_articles, f, indent=2, ensure_ascii=False)
+    with open(RECENT_NEWS_PATH, "wb") as f:
+        f.write(dump_json(new_articles, indent=2))
     log(f"🆕 Wrote {len(new_articles)} recent articles → {RECENT_NEWS_PATH}")
 
 def clear_recent_file():
     os.makedirs(os.path.dirname(RECENT_NEWS_PATH), exist_ok=True)
-    with open(RECENT_NEWS_PATH, "w", encoding="utf-8") as f:
-        json.dump([], f, indent=2, ensure_ascii=False)
+    with open(RECENT_NEWS_PATH, "wb") as f:
+        f.write(dump_json([], indent=2))
     log("🧹 Cleared recent file (livemint_latest_recent.json).")
 
 def fetch_livemint_headlines(max_articles=MAX_ARTICLES):
@@ -98,19 +104,14 @@ LIVEMINT_BOILERPLATE_REGEXES = [
     r"(?i)^.*?remove\s+some\s+to\s+bookmark\s+this\s+image.*$",
 ]
 
-def _strip_lines_by_regexes(text: str, regex_list) -> str:
-    if not text:
-        return text
-    lines = [ln.strip() for ln in text.split("\n")]
-    kept = [ln for ln in lines if not any(re.search(rx, ln) for rx in regex_list)]
-    out = "\n".join(l for l in kept if l)
-    return re.sub(r"\n{3,}", "\n\n", out).strip()
+DISCLAIMER_UNION_RE = compile_line_union(DISCLAIMER_REGEXES)
+LIVEMINT_BOILERPLATE_UNION_RE = compile_line_union(LIVEMINT_BOILERPLATE_REGEXES)
 
 def strip_disclaimer_lines(text: str) -> str:
-    return _strip_lines_by_regexes(text, DISCLAIMER_REGEXES)
+    return strip_lines_by_regexes(text, DISCLAIMER_UNION_RE)
 
 def strip_livemint_boilerplate(text: str) -> str:
-    return _strip_lines_by_regexes(text, LIVEMINT_BOILERPLATE_REGEXES)
+    return strip_lines_by_regexes(text, LIVEMINT_BOILERPLATE_UNION_RE)
 
 def drop_disclaimer_nodes(soup: BeautifulSoup) -> None:
     try:
@@ -160,33 +161,15 @@ def save_articles_to_json(articles_data):
     os.makedirs(os.path.dirname(RAW_NEWS_PATH), exist_ok=True)
     filename = RAW_NEWS_PATH
 
-    existing_urls = set()
-    existing_article_ids = set()
-    if os.path.exists(filename):
-        with open(filename, "r", encoding="utf-8") as f:
-            try:
-                existing_data = json.load(f)
-                existing_urls = {item.get("url") for item in existing_data}
-                existing_article_ids = {item.get("article_id") for item in existing_data}
-            except Exception:
-                existing_data = []
-    else:
-        existing_data = []
-
-    new_articles = [
-        a for a in articles_data
-        if not (a["url"] in existing_urls and a["article_id"] in existing_article_ids)
-    ]
+    # Drop only if BOTH url AND article_id already exist; checked against the
+    # store's .fieldkeys sidecar and appended in place
+    new_articles, _ = append_unseen(filename, articles_data)
 
     if not new_articles:
         log("🟡 No new JSON articles to append (deduplication).")
         save_recent_json([])  # overwrite recent with empty
         return []
 
-    all_data = existing_data + new_articles
-    with open(filename, "w", encoding="utf-8") as f:
-        json.dump(all_data, f, indent=2, ensure_ascii=False)
-
     log(f"💾 JSON updated: {filename} ({len(new_articles)} new)")
     save_recent_json(new_articles)
     return new_articles
@@ -3,14 +3,19 @@ from bs4 import BeautifulSoup
 from datetime import datetime
 import re
 import os
-import json
 import time
 import hashlib
 
+from modules.cumulative_store import append_unseen, dump_json
 from config import MONEYCONTROL_RAW_NEWS_PATH, MONEYCONTROL_RECENT_NEWS_PATH, LOG_FILE, MAX_ARTICLES
 
 headers = {"User-Agent": "Mozilla/5.0"}
 
+# One pooled session per source: keep-alive connections are reused across the
+# index page and every article page instead of a new TCP+TLS handshake per GET
+session = requests.Session()
+session.headers.update(headers)
+
 
 def log(msg):
     os.makedirs(os.path.dirname(LOG_FILE), exist_ok=True)
@@ -22,7 +27,7 @@ def log(msg):
 def safe_get(url, max_retries=3, timeout=10):
     for i in range(max_retries):
         try:
-            response = requests.get(url, headers=headers, timeout=timeout)
+            response = session.get(url, timeout=timeout)
             if response.status_code == 200:
                 return response
             else:
@@ -40,15 +45,15 @@ def extract_article_id(url):
 
 def save_recent_json(new_articles):
     os.makedirs(os.path.dirname(MONEYCONTROL_RECENT_NEWS_PATH), exist_ok=True)
-    with open(MONEYCONTROL_RECENT_NEWS_PATH, "w", encoding="utf-8") as f:
-        json.dump(new_articles, f, indent=2, ensure_ascii=False)
+    with open(MONEYCONTROL_RECENT_NEWS_PATH, "wb") as f:
+        f.write(dump_json(new_articles, indent=2))
     log(f"🆕 Wrote {len(new_articles)} recent articles → {MONEYCONTROL_RECENT_NEWS_PATH}")
 
 
 def clear_recent_file():
     os.makedirs(os.path.dirname(MONEYCONTROL_RECENT_NEWS_PATH), exist_ok=True)
-    with open(MONEYCONTROL_RECENT_NEWS_PATH, "w", encoding="utf-8") as f:
-        json.dump([], f, indent=2, ensure_ascii=False)
+    with open(MONEYCONTROL_RECENT_NEWS_PATH, "wb") as f:
+        f.write(dump_json([], indent=2))
     log("🧹 Cleared recent file (moneycontrol_latest_recent.json).")
 
 
@@ -145,33 +150,15 @@ def save_articles_to_json(articles_data):
     os.makedirs(os.path.dirname(MONEYCONTROL_RAW_NEWS_PATH), exist_ok=True)
     filename = MONEYCONTROL_RAW_NEWS_PATH
 
-    existing_urls = set()
-    existing_article_ids = set()
-    if os.path.exists(filename):
-        with open(filename, "r", encoding="utf-8") as f:
-            try:
-                existing_data = json.load(f)
-                existing_urls = {item.get("url") for item in existing_data}
-                existing_article_ids = {item.get("article_id") for item in existing_data}
-            except Exception:
-                existing_data = []
-    else:
-        existing_data = []
-
-    new_articles = [
-    a for a in articles_data
-    if not (a["url"] in existing_urls and a["article_id"] in existing_article_ids)
-]
+    # Drop only if BOTH url AND article_id already exist; checked against the
+    # store's .fieldkeys sidecar and appended in place
+    new_articles, _ = append_unseen(filename, articles_data)
 
     if not new_articles:
         log("🟡 No new JSON articles to append (deduplication).")
         save_recent_json([])  # still overwrite recent with empty
         return []
 
-    all_data = existing_data + new_articles
-    with open(filename, "w", encoding="utf-8") as f:
-        json.dump(all_data, f, indent=2, ensure_ascii=False)
-
     log(f"💾 JSON updated: {filename} ({len(new_articles)} new)")
     save_recent_json(new_articles)
     return new_articles
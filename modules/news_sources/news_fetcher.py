@@ -1,14 +1,14 @@
 # modules/news_sources/news_fetcher.py
 import os
-import json
 from datetime import datetime
 
+from modules.cumulative_store import dump_json
 from config import MAX_ARTICLES, LOG_FILE, RECENT_MERGED_PATH
 
 os.makedirs(os.path.dirname(RECENT_MERGED_PATH), exist_ok=True)
 # Pre-create the file so it exists even if all sources fail
-with open(RECENT_MERGED_PATH, "w", encoding="utf-8") as f:
-    json.dump([], f, ensure_ascii=False, indent=2)
+with open(RECENT_MERGED_PATH, "wb") as f:
+    f.write(dump_json([], indent=2))
 
 
 from modules.news_sources.moneycontrol import fetch_and_save_articles as fetch_moneycontrol
@@ -61,8 +61,8 @@ def fetch_all_sources(max_articles: int = MAX_ARTICLES):
         log(f"🟡 Global dedup removed {len(all_new) - len(merged)} duplicate item(s).")
 
     os.makedirs(os.path.dirname(RECENT_MERGED_PATH), exist_ok=True)
-    with open(RECENT_MERGED_PATH, "w", encoding="utf-8") as f:
-        json.dump(merged, f, ensure_ascii=False, indent=2)
+    with open(RECENT_MERGED_PATH, "wb") as f:
+        f.write(dump_json(merged, indent=2))
 
     log(f"💾 Saved merged recent: {RECENT_MERGED_PATH} ({len(merged)} items)")
     return merged
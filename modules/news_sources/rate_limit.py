@@ -0,0 +1,27 @@
+"""
+Rate Limit Module
+
+Politeness throttle for scrapers that fetch article pages from a thread
+pool: request starts are spaced at least `interval` seconds apart across
+all threads, replacing the old sleep between sequential fetches while
+letting the network waits overlap.
+"""
+
+import threading
+import time
+
+
+class RateLimiter:
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._next_start = 0.0
+
+    def wait(self):
+        """Block until this caller may start its request."""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + self.interval
+        if start > now:
+            time.sleep(start - now)
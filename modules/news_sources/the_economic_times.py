@@ -2,11 +2,11 @@ import requests
 from bs4 import BeautifulSoup
 from datetime import datetime
 import os
-import json
 import hashlib
 import time
 import re
 
+from modules.cumulative_store import append_unseen, dump_json
 from config import (
     ET_RAW_NEWS_PATH as RAW_NEWS_PATH,
     ET_RECENT_NEWS_PATH as RECENT_NEWS_PATH,
@@ -16,6 +16,11 @@ from config import (
 
 headers = {"User-Agent": "Mozilla/5.0"}
 
+# One pooled session per source: keep-alive connections are reused across the
+# index page and every article page instead of a new TCP+TLS handshake per GET
+session = requests.Session()
+session.headers.update(headers)
+
 def log(msg):
     os.makedirs(os.path.dirname(LOG_FILE), exist_ok=True)
     with open(LOG_FILE, "a", encoding="utf-8") as f:
@@ -25,7 +30,7 @@ def log(msg):
 def safe_get(url, max_retries=3, timeout=10):
     for i in range(max_retries):
         try:
-            response = requests.get(url, headers=headers, timeout=timeout)
+            response = session.get(url, timeout=timeout)
             if response.status_code == 200:
                 return response
             else:
@@ -249,46 +254,29 @@ def fetch_full_article_et(url):
 
 def _save_recent_json(new_articles):
     os.makedirs(os.path.dirname(RECENT_NEWS_PATH), exist_ok=True)
-    with open(RECENT_NEWS_PATH, "w", encoding="utf-8") as f:
-        json.dump(new_articles, f, ensure_ascii=False, indent=2)
+    with open(RECENT_NEWS_PATH, "wb") as f:
+        f.write(dump_json(new_articles, indent=2))
     log(f"🆕 Wrote {len(new_articles)} recent articles → {RECENT_NEWS_PATH}")
 
 def _clear_recent_file():
     os.makedirs(os.path.dirname(RECENT_NEWS_PATH), exist_ok=True)
-    with open(RECENT_NEWS_PATH, "w", encoding="utf-8") as f:
-        json.dump([], f, ensure_ascii=False, indent=2)
+    with open(RECENT_NEWS_PATH, "wb") as f:
+        f.write(dump_json([], indent=2))
     log("🧹 Cleared recent file (et_latest_recent.json).")
 
 def save_articles_to_json(articles_data):
     os.makedirs(os.path.dirname(RAW_NEWS_PATH), exist_ok=True)
     filename = RAW_NEWS_PATH
 
-    existing_urls, existing_ids = set(), set()
-    if os.path.exists(filename):
-        with open(filename, "r", encoding="utf-8") as f:
-            try:
-                existing = json.load(f)
-            except Exception:
-                existing = []
-        existing_urls = {it.get("url") for it in existing}
-        existing_ids  = {it.get("article_id") for it in existing}
-    else:
-        existing = []
-
-    new_articles = [
-        a for a in articles_data
-        if not (a["url"] in existing_urls and a["article_id"] in existing_ids)
-    ]
+    # Drop only if BOTH url AND article_id already exist; checked against the
+    # store's .fieldkeys sidecar and appended in place
+    new_articles, _ = append_unseen(filename, articles_data)
 
     if not new_articles:
         log("🟡 No new JSON articles to append (deduplication).")
         _clear_recent_file()
         return []
 
-    all_data = existing + new_articles
-    with open(filename, "w", encoding="utf-8") as f:
-        json.dump(all_data, f, ensure_ascii=False, indent=2)
-
     log(f"💾 JSON updated: {filename} ({len(new_articles)} new)")
     _save_recent_json(new_articles)
     return new_articles
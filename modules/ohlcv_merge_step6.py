@@ -12,6 +12,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import pandas as pd
 from datetime import datetime, timedelta, timezone
 
+from modules.cumulative_store import append_unique
 from config import (
     LOG_FILE,
     FEATURES_NEW_PATH,
@@ -116,15 +117,11 @@ def load_json(path: str) -> list:
 
 def append_to_all(all_path: str, new_rows: list) -> list:
     """Append new_rows to all_path, deduplicating by (article_id, symbol)."""
-    existing = load_json(all_path)
-    existing_keys = {(r.get("article_id"), r.get("symbol")) for r in existing}
-    
-    fresh = [r for r in new_rows if (r.get("article_id"), r.get("symbol")) not in existing_keys]
+    # Dedup via the store's .keys sidecar; appends in place
+    fresh, total = append_unique(all_path, new_rows)
     
     if fresh:
-        all_data = existing + fresh
-        save_json(all_path, all_data)
-        log(f"💾 Appended {len(fresh)} new rows to {all_path} (total: {len(all_data)})")
+        log(f"💾 Appended {len(fresh)} new rows to {all_path} (total: {total})")
     else:
         log(f"🟡 No new rows to append to {all_path}")
     
@@ -242,20 +239,21 @@ def get_pre_market_stats(company_name, news_time):
     
     # Granular Lookbacks
     validation_times = [1, 2, 5, 10, 15, 20, 30, 45, 60, 90, 120]
+    timestamps = past_data["timestamp"].to_numpy()
     
     for minutes in validation_times:
         # Find the row closest to 'minutes' ago
         target_time = reference_time - timedelta(minutes=minutes)
         
-        # Get slice of data up to that target time
         # We want the specific candle at T-minus-X minutes
         # Since likely 1-min intervals, we look for timestamp <= target_time
         
-        # Taking the closest row BEFORE or AT expected time
-        closest_row_candidates = past_data[past_data["timestamp"] <= target_time]
+        # Taking the closest row BEFORE or AT expected time: past_data is sorted,
+        # so that is the row just left of the insertion point (no mask, no copy)
+        pos = timestamps.searchsorted(pd.Timestamp(target_time).to_datetime64(), side="right") - 1
         
-        if not closest_row_candidates.empty:
-            row = closest_row_candidates.iloc[-1]
+        if pos >= 0:
+            row = past_data.iloc[pos]
             suffix = f"_{minutes}min"
             stats[f"open{suffix}"] = float(row["open"])
             stats[f"high{suffix}"] = float(row["high"])
@@ -0,0 +1,44 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from modules.correlation_checker_independentstep import _canonicalize_minute_bars
+
+
+class CanonicalizeMinuteBarsTest(unittest.TestCase):
+    def test_all_nan_timestamps_give_empty_frame(self):
+        day_df = pd.DataFrame(
+            {
+                "timestamp": [np.nan, np.nan],
+                "open": [1.0, 2.0],
+                "high": [1.0, 2.0],
+                "low": [1.0, 2.0],
+                "close": [1.0, 2.0],
+                "volume": [10.0, 20.0],
+            }
+        )
+        self.assertTrue(_canonicalize_minute_bars(day_df).empty)
+
+    def test_duplicate_ticks_collapse_to_one_minute(self):
+        day_df = pd.DataFrame(
+            {
+                "timestamp": ["2024-01-02 09:15:05", "2024-01-02 09:15:40", None],
+                "open": [1.0, 2.0, 9.0],
+                "high": [3.0, 2.5, 9.0],
+                "low": [0.5, 1.5, 9.0],
+                "close": [1.0, 2.0, 9.0],
+                "volume": [10.0, 20.0, 99.0],
+            }
+        )
+        bars = _canonicalize_minute_bars(day_df)
+        self.assertEqual(len(bars), 1)
+        row = bars.iloc[0]
+        self.assertEqual(
+            (row["open"], row["high"], row["low"], row["close"], row["volume"]),
+            (1.0, 3.0, 0.5, 2.0, 30.0),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()